@@ -1,8 +1,10 @@
 # api/debug_run_report.py
 # Small wrapper to run the report generator with maximum verbosity and log everywhere.
 
+import os
 import sys
-import subprocess
+import asyncio
+import atexit
 from pathlib import Path
 import traceback
 import time
@@ -12,25 +14,42 @@ SCRIPT = ROOT / "api" / "generate_report_pro.py"
 OUT = ROOT / "data" / "debug_report_wrapper.pdf"
 LOG = ROOT / "data" / "debug_wrapper.log"
 
+# One buffered handle for the whole run instead of an open/close per log line.
+_LOG_FH = None
+
+def _log_fh():
+    global _LOG_FH
+    if _LOG_FH is None:
+        LOG.parent.mkdir(parents=True, exist_ok=True)
+        _LOG_FH = open(LOG, "a", buffering=65536, encoding="utf-8")
+        atexit.register(_LOG_FH.close)
+    return _LOG_FH
+
 def write(s):
     print(s)
+    _log_fh().write(time.strftime("%Y-%m-%d %H:%M:%S") + " " + str(s) + "\n")
+
+async def run_script(cmd, timeout):
+    proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE,
+                                                stderr=asyncio.subprocess.PIPE, cwd=str(ROOT))
     try:
-        LOG.write_text(str(time.strftime("%Y-%m-%d %H:%M:%S")) + " " + str(s) + "\n", append=True)  # Python <3.11 fallback: will replace next line
-    except TypeError:
-        # older python versions do not support append param: fallback:
-        with open(LOG, "a", encoding="utf-8") as f:
-            f.write(str(time.strftime("%Y-%m-%d %H:%M:%S")) + " " + str(s) + "\n")
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, stdout.decode("utf-8", errors="replace"), stderr.decode("utf-8", errors="replace")
 
 def main():
     write(f"Running: {sys.executable} {SCRIPT} --out {OUT} --name \"Navaneeth Kaku\" --api http://127.0.0.1:8000/rca")
     try:
-        proc = subprocess.run([sys.executable, str(SCRIPT), "--out", str(OUT), "--name", "Navaneeth Kaku", "--api", "http://127.0.0.1:8000/rca"],
-                              capture_output=True, text=True, cwd=str(ROOT), timeout=90)
-        write("RETURN CODE: " + str(proc.returncode))
-        write("STDOUT:\n" + (proc.stdout or "<no stdout>"))
-        write("STDERR:\n" + (proc.stderr or "<no stderr>"))
-    except subprocess.TimeoutExpired as e:
-        write("TIMEOUT: " + str(e))
+        cmd = [sys.executable, str(SCRIPT), "--out", str(OUT), "--name", "Navaneeth Kaku", "--api", "http://127.0.0.1:8000/rca"]
+        returncode, stdout, stderr = asyncio.run(run_script(cmd, timeout=90))
+        write("RETURN CODE: " + str(returncode))
+        write("STDOUT:\n" + (stdout or "<no stdout>"))
+        write("STDERR:\n" + (stderr or "<no stderr>"))
+    except asyncio.TimeoutError:
+        write("TIMEOUT: report generator did not finish within 90s")
         write(traceback.format_exc())
     except Exception as e:
         write("EXCEPTION: " + str(e))
@@ -38,9 +57,12 @@ def main():
 
     write("Files in data directory (top 30):")
     try:
-        files = sorted((ROOT / "data").iterdir(), key=lambda p: p.stat().st_mtime, reverse=True)[:30]
-        for p in files:
-            write(f" - {p.name} (size={p.stat().st_size})")
+        # scandir entries cache their stat result: one stat per file instead of two
+        with os.scandir(ROOT / "data") as it:
+            files = [(e.name, e.stat().st_mtime, e.stat().st_size) for e in it]
+        files.sort(key=lambda f: f[1], reverse=True)
+        for name, _, size in files[:30]:
+            write(f" - {name} (size={size})")
     except Exception:
         write("Unable to list data dir:\n" + traceback.format_exc())
 
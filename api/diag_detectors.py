@@ -2,9 +2,14 @@
 """
 Diagnostic helper: discovers detectors in detectors/ and attempts to call them.
 Run: python api/diag_detectors.py
+
+Detectors are called in a multiprocessing pool (one detector per task) so
+each one's pandas work gets its own core; output is collected per detector
+and printed in discovery order.
 """
 
-import sys, pkgutil, importlib, traceback
+import sys, os, io, pkgutil, importlib, traceback, contextlib
+import multiprocessing
 from pathlib import Path
 import inspect
 import pandas as pd
@@ -12,100 +17,141 @@ import pandas as pd
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DETECTORS_PATH = PROJECT_ROOT / "detectors"
 DETECTORS_PKG = "detectors"
+csv_candidate = PROJECT_ROOT / "data" / "transactions.csv"
 
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-print("PROJECT_ROOT:", PROJECT_ROOT)
-print("DETECTORS_PATH:", DETECTORS_PATH)
-print()
+# per-process sample frame, filled by _preload in each worker
+sample_df = None
+
+
+def discover():
+    detectors = []
+    for finder, name, ispkg in pkgutil.iter_modules([str(DETECTORS_PATH)]):
+        full_mod = f"{DETECTORS_PKG}.{name}"
+        print("Importing", full_mod)
+        try:
+            mod = importlib.import_module(full_mod)
+        except Exception:
+            print("  IMPORT ERROR for", full_mod)
+            print(traceback.format_exc())
+            continue
+
+        for attr in dir(mod):
+            if attr.startswith("detect_") and callable(getattr(mod, attr)):
+                detectors.append((full_mod + "." + attr, getattr(mod, attr)))
+    return detectors
+
 
-detectors = []
-for finder, name, ispkg in pkgutil.iter_modules([str(DETECTORS_PATH)]):
-    full_mod = f"{DETECTORS_PKG}.{name}"
-    print("Importing", full_mod)
+def load_sample_df(csv_path):
+    # Try to prepare a sample df if possible
+    if Path(csv_path).exists():
+        try:
+            df = pd.read_csv(csv_path, parse_dates=True)
+            print("Loaded sample df from", csv_path)
+            return df
+        except Exception:
+            print("Failed to load sample CSV", csv_path)
+            return None
+    print("No transactions.csv found, sample_df will be None")
+    return None
+
+
+def _preload(csv_path):
+    """Pool initializer: load the sample frame once per worker."""
+    global sample_df
+    with contextlib.redirect_stdout(io.StringIO()):
+        sample_df = load_sample_df(csv_path)
+
+
+def call_detector(name, func):
+    # try no-arg
     try:
-        mod = importlib.import_module(full_mod)
-    except Exception:
-        print("  IMPORT ERROR for", full_mod)
-        print(traceback.format_exc())
-        continue
+        out = func()
+        print("-> called no-arg, output type:", type(out))
+        print(out)
+        return
+    except TypeError:
+        pass
 
-    for attr in dir(mod):
-        if attr.startswith("detect_") and callable(getattr(mod, attr)):
-            detectors.append((full_mod + "." + attr, getattr(mod, attr)))
+    # inspect signature
+    sig = inspect.signature(func)
+    params = sig.parameters
+    kwargs = {}
+    if any("csv" in p.lower() or "path" in p.lower() for p in params):
+        # pass path string if available
+        csv_path = str(csv_candidate) if csv_candidate.exists() else None
+        if csv_path:
+            for n in params:
+                if "csv" in n.lower() or "path" in n.lower():
+                    kwargs[n] = csv_path
+    elif any(p.lower() in ("df","data","dataframe") for p in params):
+        for n in params:
+            if n.lower() in ("df","data","dataframe"):
+                kwargs[n] = sample_df
 
-print("\nDiscovered detectors:", [d[0] for d in detectors])
-print()
+    if kwargs:
+        out = func(**kwargs)
+        print("-> called with kwargs", kwargs.keys(), "output type:", type(out))
+        print(out)
+        return
 
-# Try to prepare a sample df if possible
-sample_df = None
-csv_candidate = PROJECT_ROOT / "data" / "transactions.csv"
-if csv_candidate.exists():
+    # fallback: try single arg: df then csv str
     try:
-        sample_df = pd.read_csv(csv_candidate, parse_dates=True)
-        print("Loaded sample df from", csv_candidate)
+        if sample_df is not None:
+            out = func(sample_df)
+            print("-> called with sample_df fallback:", type(out))
+            print(out)
+            return
     except Exception:
-        sample_df = None
-        print("Failed to load sample CSV", csv_candidate)
-else:
-    print("No transactions.csv found, sample_df will be None")
+        pass
 
-print("\nCalling detectors one by one (safe):\n")
-for name, func in detectors:
-    print("===", name, "===")
     try:
-        # try no-arg
-        try:
-            out = func()
-            print("-> called no-arg, output type:", type(out))
+        if csv_candidate.exists():
+            out = func(str(csv_candidate))
+            print("-> called with csv path fallback:", type(out))
             print(out)
-            continue
-        except TypeError:
-            pass
-
-        # inspect signature
-        sig = inspect.signature(func)
-        params = sig.parameters
-        kwargs = {}
-        if any("csv" in p.lower() or "path" in p.lower() for p in params):
-            # pass path string if available
-            csv_path = str(csv_candidate) if csv_candidate.exists() else None
-            if csv_path:
-                for n in params:
-                    if "csv" in n.lower() or "path" in n.lower():
-                        kwargs[n] = csv_path
-        elif any(p.lower() in ("df","data","dataframe") for p in params):
-            for n in params:
-                if n.lower() in ("df","data","dataframe"):
-                    kwargs[n] = sample_df
+            return
+    except Exception:
+        pass
 
-        if kwargs:
-            out = func(**kwargs)
-            print("-> called with kwargs", kwargs.keys(), "output type:", type(out))
-            print(out)
-            continue
+    print("-> Could not call detector:", name)
 
-        # fallback: try single arg: df then csv str
-        try:
-            if sample_df is not None:
-                out = func(sample_df)
-                print("-> called with sample_df fallback:", type(out))
-                print(out)
-                continue
-        except Exception:
-            pass
 
+def _call_one(name_func):
+    """Pool task: call one detector, return everything it printed."""
+    name, func = name_func
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        print("===", name, "===")
         try:
-            if csv_candidate.exists():
-                out = func(str(csv_candidate))
-                print("-> called with csv path fallback:", type(out))
-                print(out)
-                continue
+            call_detector(name, func)
         except Exception:
-            pass
+            print("EXCEPTION calling", name)
+            print(traceback.format_exc())
+    return buf.getvalue()
 
-        print("-> Could not call detector:", name)
-    except Exception:
-        print("EXCEPTION calling", name)
-        print(traceback.format_exc())
+
+def main():
+    print("PROJECT_ROOT:", PROJECT_ROOT)
+    print("DETECTORS_PATH:", DETECTORS_PATH)
+    print()
+
+    detectors = discover()
+    print("\nDiscovered detectors:", [d[0] for d in detectors])
+    print()
+
+    # load once here only to report whether the sample is usable
+    load_sample_df(csv_candidate)
+
+    print("\nCalling detectors in parallel (safe):\n")
+    processes = min(len(detectors), os.cpu_count() or 1) or 1
+    with multiprocessing.Pool(processes=processes, initializer=_preload,
+                              initargs=(str(csv_candidate),)) as pool:
+        for output in pool.map(_call_one, detectors):
+            print(output, end="")
+
+
+if __name__ == "__main__":
+    main()
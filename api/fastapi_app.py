@@ -2,36 +2,139 @@
 FastAPI backend for AOHI (Adaptive Operational Health Intelligence).
 
 Exposes:
+    - /               : hello / pointer to /report_pro
     - /health         : basic API health check
     - /incidents      : run all detectors and return incidents JSON
     - /rca            : simple rule-based RCA on top of incidents
-    - /report_pro     : generate a PDF report using generate_report_pro.py
+    - /report_pro     : generate a PDF report with generate_report_pro.py
+    - /admin/reload   : re-import detector modules (needs AOHI_ENABLE_ADMIN=1)
 """
 
 from __future__ import annotations
 
+import asyncio
+import fnmatch
+import hashlib
+import importlib
 import logging
+import os
 import sys
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager, suppress
+from operator import methodcaller
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from subprocess import run
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, Query
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas/numpy and the detector modules are imported lazily (see
+# json_default and get_detectors; the lifespan hook warms the registry at
+# startup) so that importing the API module doesn't pay for them.
+
+# -------------------------------------------------------------------
+# JSON rendering
+# -------------------------------------------------------------------
+
+def frame_to_records(df: "pd.DataFrame") -> List[Dict[str, Any]]:
+    """
+    DataFrame -> list of JSON-ready dicts. Datetime columns are formatted
+    once per column and nulls replaced in one pass, instead of converting
+    cell by cell.
+    """
+    out = df.copy(deep=False)
+    for col in out.select_dtypes(include=["datetime", "datetimetz"]).columns:
+        out[col] = out[col].dt.strftime("%Y-%m-%dT%H:%M:%S")
+    out = out.astype(object).where(out.notna(), None)
+    return out.to_dict(orient="records")
+
+
+def _json_handler(tp: type) -> Callable[[Any], Any]:
+    import numpy as np
+    import pandas as pd
+
+    if issubclass(tp, pd.DataFrame):
+        return frame_to_records
+    if issubclass(tp, pd.Series):
+        return methodcaller("tolist")
+    if hasattr(tp, "isoformat"):
+        return methodcaller("isoformat")
+    if issubclass(tp, np.generic):
+        return methodcaller("item")
+    return str
+
+
+# type -> converter used by json_default; each new type is resolved once
+# through _json_handler's isinstance chain, then served by a dict lookup.
+_JSON_HANDLERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def json_default(obj: Any) -> Any:
+    """
+    Fallback for values orjson can't serialize natively (pandas Timestamps,
+    anything else with .isoformat(), odd numpy types, DataFrames/Series
+    returned by detectors). Containers, numpy scalars and NaN/inf (-> null)
+    are handled by orjson itself.
+    """
+    handler = _JSON_HANDLERS.get(type(obj))
+    if handler is None:
+        handler = _JSON_HANDLERS[type(obj)] = _json_handler(type(obj))
+    return handler(obj)
+
+
+def dumps_json(content: Any) -> bytes:
+    return orjson.dumps(
+        content,
+        default=json_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the recursive stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
 
-# --- Detectors ---
-from detectors import ewma, geo, latency, revenue, seasonal_zscore
-from detectors import run_all_detectors, run_extra_detectors
 
 # -------------------------------------------------------------------
 # Basic app setup
 # -------------------------------------------------------------------
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # import the detector modules once at startup (off the event loop), so
+    # the first request doesn't pay for it; module import itself stays light
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, get_detectors)
+    # drop cached PDFs that were built from an older transactions.csv
+    await loop.run_in_executor(None, remove_stale_reports)
+    # keep /incidents and /rca warm in the background (see refresh_loop)
+    task = asyncio.create_task(refresh_loop()) if REFRESH_INTERVAL > 0 else None
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+
 app = FastAPI(
     title="AOHI API",
     version="0.1",
     description="AOHI (Adaptive Operational Health Intelligence) backend API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -48,86 +151,139 @@ logger.setLevel(logging.INFO)
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 TRANSACTIONS_CSV = DATA_DIR / "transactions.csv"
+REPORT_CACHE_SIZE = 16
+# temp files from builds that never finished are removed after this long
+REPORT_TMP_MAX_AGE = 3600
+# optional max age for cached /incidents and /rca payloads; by default (0)
+# they are only recomputed when transactions.csv changes, on force_run or
+# after /admin/reload
+RESPONSE_TTL = float(os.getenv("AOHI_RESPONSE_TTL", "0"))
+# how often the background task checks for stale payloads; 0 disables it
+REFRESH_INTERVAL = float(os.getenv("AOHI_REFRESH_INTERVAL", "1"))
 
 
 # -------------------------------------------------------------------
 # Helpers
 # -------------------------------------------------------------------
 
-def sanitize_for_json(obj: Any) -> Any:
-    """
-    Convert values coming from detectors into JSON-safe types.
-    Keeps "inf" as string if needed.
-    """
-    import numpy as np
-    import pandas as pd
-
-    if obj is None:
-        return None
-
-    if hasattr(obj, "isoformat"):
-        try:
-            return obj.isoformat()
-        except Exception:
-            pass
+# Detector registry: dotted names, resolved to functions on first use by
+# get_detectors() and then reused by every request.
+DETECTOR_NAMES: List[str] = [
+    # Base detectors
+    "detectors.ewma.detect_ewma_failed",
+    "detectors.geo.detect_geo_failures",
+    "detectors.latency.detect_latency_spike",
+    "detectors.revenue.detect_revenue_drop",
+    "detectors.seasonal_zscore.detect_failed_tx_spike",
+    # Meta-detectors
+    "detectors.run_all_detectors.detect_ewma_failed",
+    "detectors.run_extra_detectors.detect_geo_failures",
+]
 
-    if isinstance(obj, (np.generic, pd.Timestamp)):
-        try:
-            return obj.item()
-        except Exception:
-            return str(obj)
+_DETECTORS: List[Tuple[str, Callable[[str], Any]]] = []
+_DETECTORS_LOCK = threading.Lock()
+# registry entries that failed validation: dotted name -> reason (see /health)
+_DETECTOR_ERRORS: Dict[str, str] = {}
 
-    if isinstance(obj, (list, tuple)):
-        return [sanitize_for_json(x) for x in obj]
 
-    if isinstance(obj, dict):
-        return {str(k): sanitize_for_json(v) for k, v in obj.items()}
+def get_detectors() -> List[Tuple[str, Callable[[str], Any]]]:
+    """
+    Return the (dotted name, callable) registry, importing detectors once.
 
-    return obj
+    Entries are validated here rather than per request: a detector whose
+    module fails to import (or that isn't callable) is left out of the
+    registry and reported on /health, instead of failing every /incidents.
+    """
+    if not _DETECTORS:
+        with _DETECTORS_LOCK:
+            if not _DETECTORS:
+                resolved = []
+                _DETECTOR_ERRORS.clear()
+                for name in DETECTOR_NAMES:
+                    module_name, attr = name.rsplit(".", 1)
+                    try:
+                        func = getattr(importlib.import_module(module_name), attr)
+                        if not callable(func):
+                            raise TypeError(f"{name} is not callable")
+                    except Exception as e:
+                        logger.error("Detector %s disabled: %s", name, e)
+                        _DETECTOR_ERRORS[name] = str(e)
+                        continue
+                    resolved.append((name, func))
+                _DETECTORS.extend(resolved)
+    return _DETECTORS
+
+
+def reload_detectors() -> List[str]:
+    """
+    Re-import the detector modules (shared loader first, then in registry
+    order so the meta-detectors pick up the fresh base functions) and
+    rebuild the registry. Used by /admin/reload after editing a detector.
+    """
+    module_names = ["detectors.loader"]
+    for name in DETECTOR_NAMES:
+        module_name = name.rsplit(".", 1)[0]
+        if module_name not in module_names:
+            module_names.append(module_name)
+
+    with _DETECTORS_LOCK:
+        for module_name in module_names:
+            module = sys.modules.get(module_name)
+            if module is not None:
+                importlib.reload(module)
+        _DETECTORS.clear()
+
+    with _RESPONSE_LOCK:
+        _RESPONSE_CACHE.clear()
+
+    return [name for name, _ in get_detectors()]
+
+
+# Detectors are mostly pandas/NumPy work, so running them on threads cuts
+# /incidents latency to roughly the slowest detector instead of the sum.
+DETECTOR_WORKERS = int(os.getenv("AOHI_DETECTOR_WORKERS", str(min(8, len(DETECTOR_NAMES)))))
+DETECTOR_TIMEOUT = float(os.getenv("AOHI_DETECTOR_TIMEOUT", "60"))
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=DETECTOR_WORKERS,
+    thread_name_prefix="aohi-detector",
+)
 
 
 def run_all_incident_detectors() -> Dict[str, Any]:
     """
-    Call all detector functions and bundle their results.
+    Call all registered detector functions concurrently and bundle their
+    results (in registry order).
+
+    The meta-detector entries re-export base detector functions, so each
+    distinct function is run once and its result reported under every
+    registered name.
     """
     if not TRANSACTIONS_CSV.exists():
         raise FileNotFoundError(f"Transactions CSV not found at {TRANSACTIONS_CSV}")
 
     csv_path = str(TRANSACTIONS_CSV)
-    incidents: List[Dict[str, Any]] = []
+    detectors = get_detectors()
+    futures: Dict[Callable[[str], Any], Future] = {}
+    for _, func in detectors:
+        if func not in futures:
+            futures[func] = _EXECUTOR.submit(func, csv_path)
+    _, not_done = wait(futures.values(), timeout=DETECTOR_TIMEOUT)
 
-    def add_detector(name: str, func):
+    incidents: List[Dict[str, Any]] = []
+    for name, func in detectors:
+        future = futures[func]
+        if future in not_done:
+            future.cancel()
+            logger.warning("Detector %s timed out after %.0fs", name, DETECTOR_TIMEOUT)
+            continue
         try:
-            raw_result = func(csv_path)
-            incidents.append(
-                {
-                    "detector": name,
-                    "result": sanitize_for_json(raw_result),
-                }
-            )
+            # raw result; ORJSONResponse takes care of numpy/pandas values
+            result = future.result()
         except Exception as e:
             # Don't crash whole API if one detector fails
             logger.warning("Detector %s failed: %s", name, e)
-
-    # Base detectors
-    add_detector("detectors.ewma.detect_ewma_failed", ewma.detect_ewma_failed)
-    add_detector("detectors.geo.detect_geo_failures", geo.detect_geo_failures)
-    add_detector("detectors.latency.detect_latency_spike", latency.detect_latency_spike)
-    add_detector("detectors.revenue.detect_revenue_drop", revenue.detect_revenue_drop)
-    add_detector(
-        "detectors.seasonal_zscore.detect_failed_tx_spike",
-        seasonal_zscore.detect_failed_tx_spike,
-    )
-
-    # Meta-detectors
-    add_detector(
-        "detectors.run_all_detectors.detect_ewma_failed",
-        run_all_detectors.detect_ewma_failed,
-    )
-    add_detector(
-        "detectors.run_extra_detectors.detect_geo_failures",
-        run_extra_detectors.detect_geo_failures,
-    )
+            continue
+        incidents.append({"detector": name, "result": result})
 
     return {"incidents": incidents}
 
@@ -137,27 +293,26 @@ def compute_simple_rca(incidents: Dict[str, Any]) -> Dict[str, Any]:
     Very small rule-based RCA engine.
     """
     results: List[Dict[str, Any]] = []
-    detectors_used: List[str] = []
 
     inc_list = incidents.get("incidents", [])
-
-    for item in inc_list:
-        name = item.get("detector")
-        if name:
-            detectors_used.append(name)
+    detectors_used: List[str] = [item["detector"] for item in inc_list if item.get("detector")]
 
     # Rule: many geo failures in IN => regional failure in IN
-    geo_items = [
-        inc for inc in inc_list if inc.get("detector") == "detectors.geo.detect_geo_failures"
-    ]
-    total_obs = 0
-    country = None
-
-    if geo_items:
-        for row in geo_items[0].get("result", []):
-            if row.get("country") == "IN":
-                country = "IN"
-                total_obs += 1
+    # (stop at the first geo entry; count matching rows without building lists)
+    geo_rows = next(
+        (
+            inc.get("result") or []
+            for inc in inc_list
+            if inc.get("detector") == "detectors.geo.detect_geo_failures"
+        ),
+        [],
+    )
+    if hasattr(geo_rows, "columns"):
+        # a detector returning a DataFrame: compare the whole column at once
+        total_obs = int((geo_rows["country"] == "IN").sum()) if "country" in geo_rows.columns else 0
+    else:
+        total_obs = sum(1 for row in geo_rows if row.get("country") == "IN")
+    country = "IN" if total_obs else None
 
     if country and total_obs > 0:
         results.append(
@@ -180,69 +335,336 @@ def compute_simple_rca(incidents: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+# Computed /incidents and /rca payloads: name -> (csv version, computed at, payload, body).
+# A dashboard polling both endpoints then runs the detectors once per CSV change
+# (or once per RESPONSE_TTL, if set), and cache hits are served as pre-encoded bytes.
+_RESPONSE_CACHE: Dict[str, Tuple[Tuple[int, int], float, Any, bytes]] = {}
+_RESPONSE_LOCK = threading.RLock()
+
+
+def transactions_version() -> Tuple[int, int]:
+    if not TRANSACTIONS_CSV.exists():
+        raise FileNotFoundError(f"Transactions CSV not found at {TRANSACTIONS_CSV}")
+    st = TRANSACTIONS_CSV.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def fresh_payload(name: str) -> Optional[Tuple[Any, bytes]]:
+    """
+    Lock-free peek at the cache: (payload, encoded JSON) if the entry for
+    `name` is still valid, else None. Cheap enough for the event loop.
+    """
+    entry = _RESPONSE_CACHE.get(name)
+    if (
+        entry is not None
+        and entry[0] == transactions_version()
+        and (RESPONSE_TTL <= 0 or time.monotonic() - entry[1] < RESPONSE_TTL)
+    ):
+        return entry[2], entry[3]
+    return None
+
+
+def cached_payload(name: str, compute: Callable[[], Any], force: bool = False) -> Tuple[Any, bytes]:
+    """
+    Return (payload, encoded JSON) for `name`, recomputing only when the
+    transactions file changed, the entry is older than RESPONSE_TTL (if set),
+    or `force` is set.
+    """
+    with _RESPONSE_LOCK:
+        hit = None if force else fresh_payload(name)
+        if hit is not None:
+            return hit
+
+        version = transactions_version()
+        payload = compute()
+        body = dumps_json(payload)
+        _RESPONSE_CACHE[name] = (version, time.monotonic(), payload, body)
+        return payload, body
+
+
+def refresh_payloads() -> Tuple[bytes, bytes]:
+    """Bring the cached /incidents and /rca payloads up to date; returns both bodies."""
+    with _RESPONSE_LOCK:
+        incidents, incidents_body = cached_payload("incidents", run_all_incident_detectors)
+        _, rca_body = cached_payload("rca", lambda: compute_simple_rca(incidents))
+    return incidents_body, rca_body
+
+
+def rerun_incidents() -> Tuple[Any, bytes]:
+    """Recompute /incidents now (force_run); /rca is rebuilt from the new results."""
+    with _RESPONSE_LOCK:
+        hit = cached_payload("incidents", run_all_incident_detectors, force=True)
+        _RESPONSE_CACHE.pop("rca", None)
+    return hit
+
+
+def get_incidents_df() -> "pd.DataFrame":
+    """
+    Current incidents as the report's flat DataFrame, built straight from the
+    cached payload (no JSON encode/decode on the way).
+    """
+    from api.generate_report_pro import flatten_incidents
+
+    incidents, _ = cached_payload("incidents", run_all_incident_detectors)
+    return flatten_incidents(incidents)
+
+
+def get_rca_rows() -> List[Dict[str, Any]]:
+    """Current RCA results as the report's list of rows (see get_incidents_df)."""
+    from api.generate_report_pro import flatten_rca
+
+    incidents, _ = cached_payload("incidents", run_all_incident_detectors)
+    rca, _ = cached_payload("rca", lambda: compute_simple_rca(incidents))
+    return flatten_rca(rca)
+
+
+async def refresh_loop() -> None:
+    """
+    Background task: every REFRESH_INTERVAL seconds recompute whatever is
+    stale, on a worker thread, so polling clients are answered from the
+    cache instead of running the detectors inside their request. While the
+    CSV is unchanged a pass is just a stat() call.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, refresh_payloads)
+        except FileNotFoundError as e:
+            logger.debug("Background refresh skipped: %s", e)
+        except Exception as e:
+            logger.warning("Background refresh failed: %s", e)
+        await asyncio.sleep(REFRESH_INTERVAL)
+
+
+def report_cache_key(name: str) -> str:
+    """
+    Cache key for a generated report: the report only depends on the
+    requested name and the current version of transactions.csv.
+    """
+    st = TRANSACTIONS_CSV.stat()
+    raw = f"{name}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def prune_report_cache(keep: int = REPORT_CACHE_SIZE) -> None:
+    """Keep only the `keep` most recently generated cached reports."""
+    with os.scandir(DATA_DIR) as it:
+        cached = [
+            (entry.stat().st_mtime, entry.path)
+            for entry in it
+            if fnmatch.fnmatchcase(entry.name, "AOHI_????????????????.pdf")
+        ]
+    cached.sort(reverse=True)
+    for _, old in cached[keep:]:
+        try:
+            os.unlink(old)
+        except OSError as e:
+            logger.warning("Could not remove cached report %s: %s", old, e)
+
+
+def remove_stale_reports() -> None:
+    """
+    Startup clean-up of data/: cached reports older than transactions.csv
+    (their key can no longer be requested) and temp files left behind by
+    builds that were interrupted, then the usual size limit.
+    """
+    try:
+        csv_mtime = TRANSACTIONS_CSV.stat().st_mtime
+    except FileNotFoundError:
+        csv_mtime = None
+    now = time.time()
+
+    with os.scandir(DATA_DIR) as it:
+        for entry in it:
+            if fnmatch.fnmatchcase(entry.name, "AOHI_????????????????.pdf"):
+                stale = csv_mtime is not None and entry.stat().st_mtime < csv_mtime
+            elif fnmatch.fnmatchcase(entry.name, "AOHI_*.pdf.tmp"):
+                stale = now - entry.stat().st_mtime > REPORT_TMP_MAX_AGE
+            else:
+                continue
+            if stale:
+                try:
+                    os.unlink(entry.path)
+                except OSError as e:
+                    logger.warning("Could not remove stale report %s: %s", entry.path, e)
+
+    prune_report_cache()
+
+
+def build_report(out_path: str, name: str) -> None:
+    """
+    Run the report generator in this process (reportlab is imported on first
+    use). The incidents/RCA come from the same cache that backs /incidents
+    and /rca, handed over as DataFrame/rows rather than round-tripped
+    through JSON, and nothing calls back into this API over HTTP.
+    """
+    from api import generate_report_pro as report
+
+    # hold the cache lock so both halves come from the same detector run
+    with _RESPONSE_LOCK:
+        df_inc = get_incidents_df()
+        rca_rows = get_rca_rows()
+    report.build_pdf(out_path=out_path, name=name, df_inc=df_inc, rca_rows=rca_rows)
+
+
+def pdf_response(path: Path, etag: str) -> FileResponse:
+    """
+    Stream a cached report. Passing stat_result saves Starlette a second
+    stat(), and Starlette uses zero-copy sendfile when the server supports it.
+    """
+    return FileResponse(
+        str(path),
+        media_type="application/pdf",
+        filename="AOHI_Final_Report.pdf",
+        stat_result=os.stat(path),
+        headers={"ETag": etag, "Cache-Control": "private, max-age=60"},
+    )
+
+
+def json_response(request: Request, body: bytes) -> Response:
+    """
+    Serve a cached JSON body with HTTP validators: clients may reuse it for
+    RESPONSE_TTL seconds (by default they revalidate every time), and a
+    matching If-None-Match gets an empty 304.
+    """
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={int(RESPONSE_TTL)}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 # -------------------------------------------------------------------
 # Endpoints
 # -------------------------------------------------------------------
 
+# Every handler is async: cheap ones (/, /health, cache hits) are answered
+# straight from the event loop without a threadpool hop, and anything that
+# blocks (detectors, module reloads, PDF builds) is pushed to a worker thread.
+
+@app.get("/")
+async def home() -> Dict[str, Any]:
+    return {"message": "AOHI API is running. Try GET /report_pro"}
+
+
 @app.get("/health")
-def health() -> Dict[str, Any]:
-    return {"status": "ok", "service": "AOHI", "version": "0.1"}
+async def health() -> Dict[str, Any]:
+    return {
+        "status": "ok",
+        "service": "AOHI",
+        "version": "0.1",
+        # detector jobs waiting for a worker thread (saturation signal)
+        "detector_queue": _EXECUTOR._work_queue.qsize(),
+        "detector_errors": _DETECTOR_ERRORS,
+    }
 
 
 @app.get("/incidents")
-def get_incidents(force_run: bool = Query(False)) -> JSONResponse:
+async def get_incidents(request: Request, force_run: bool = Query(False)) -> Response:
     try:
-        payload = run_all_incident_detectors()
-        return JSONResponse(payload)
+        if force_run:
+            hit = await run_in_threadpool(rerun_incidents)
+        else:
+            hit = fresh_payload("incidents")
+            if hit is None:
+                hit = await run_in_threadpool(cached_payload, "incidents", run_all_incident_detectors)
+        return json_response(request, hit[1])
     except Exception as e:
         logger.exception("Failed to compute incidents: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to compute incidents: {e}")
 
 
 @app.get("/rca")
-def get_rca() -> JSONResponse:
+async def get_rca(request: Request) -> Response:
     try:
-        incidents = run_all_incident_detectors()
-        rca_payload = compute_simple_rca(incidents)
-        return JSONResponse(rca_payload)
+        hit = fresh_payload("rca")
+        if hit is None:
+            _, body = await run_in_threadpool(refresh_payloads)
+        else:
+            body = hit[1]
+        return json_response(request, body)
     except Exception as e:
         logger.exception("Failed to compute RCA: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to compute RCA: {e}")
 
 
+@app.post("/admin/reload")
+async def admin_reload() -> Dict[str, Any]:
+    # only exposed when explicitly enabled (local development)
+    if os.getenv("AOHI_ENABLE_ADMIN") != "1":
+        raise HTTPException(status_code=404, detail="Not Found")
+    try:
+        return {"reloaded": await run_in_threadpool(reload_detectors)}
+    except Exception as e:
+        logger.exception("Failed to reload detectors: %s", e)
+        raise HTTPException(status_code=500, detail=f"Failed to reload detectors: {e}")
+
+
 @app.get("/report_pro")
-def generate_report(timeout: int = 60, name: str = "AOHI User"):
+async def generate_report(
+    request: Request,
+    timeout: int = 60,
+    name: str = "AOHI User",
+    force: bool = False,
+):
     """
-    Generate AOHI report by calling the local script generate_report_pro.py
-    and then return the PDF file.
+    Generate AOHI report with api/generate_report_pro.py and return the PDF.
+
+    The generator runs in-process on a worker thread (no interpreter
+    start-up or re-import of reportlab/pandas per report), so the event
+    loop keeps serving other endpoints while the PDF is being built.
+
+    PDFs are cached on disk per (name, transactions.csv version); unless
+    force=true, a cached report is returned without running the generator,
+    so its 'Generated' time is that of the build that produced it.
     """
-    out_path = DATA_DIR / "AOHI_Final_Report.pdf"
+    try:
+        key = report_cache_key(name)
+    except Exception as e:
+        logger.exception("Failed to generate report: %s", e)
+        raise HTTPException(status_code=500, detail=f"Failed to generate report: {e}")
+
+    etag = f'"{key}"'
+    out_path = DATA_DIR / f"AOHI_{key}.pdf"
 
+    if not force and out_path.exists():
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return pdf_response(out_path, etag)
+
+    # build into a unique temp file so a failed (or timed-out, still running)
+    # build never leaves a half-written cached PDF behind
+    tmp_path = DATA_DIR / f"AOHI_{key}.{uuid.uuid4().hex[:8]}.pdf.tmp"
+
+    def discard_output(build: asyncio.Future) -> None:
+        if not build.cancelled():
+            build.exception()  # retrieved here, so asyncio doesn't log it
+        tmp_path.unlink(missing_ok=True)
+
+    loop = asyncio.get_running_loop()
+    build = loop.run_in_executor(None, build_report, str(tmp_path), name)
     try:
-        # 🔧 IMPORTANT: use the SAME Python as FastAPI (your venv),
-        # not the global "python" that doesn't have pandas installed.
-        run(
-            [
-                sys.executable,        # <--- main fix
-                "-m",
-                "api.generate_report_pro",
-                "--out",
-                str(out_path),
-                "--name",
-                name,
-            ],
-            timeout=timeout,
-            check=True,
+        # shielded: on timeout the executor future is kept, not cancelled
+        await asyncio.wait_for(asyncio.shield(build), timeout=timeout)
+    except asyncio.TimeoutError:
+        # the worker thread can't be killed; remove its output once it is
+        # written (reportlab only creates the file at the end of the build)
+        build.add_done_callback(discard_output)
+        logger.error("Failed to generate report: timed out after %ss", timeout)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate report: report generator timed out after {timeout}s",
         )
     except Exception as e:
         logger.exception("Failed to generate report: %s", e)
+        with suppress(OSError):
+            tmp_path.unlink()
         raise HTTPException(status_code=500, detail=f"Failed to generate report: {e}")
 
-    if not out_path.exists():
+    if not tmp_path.exists():
         raise HTTPException(status_code=500, detail="Report file was not created.")
 
-    return FileResponse(
-        str(out_path),
-        media_type="application/pdf",
-        filename="AOHI_Final_Report.pdf",
-    )
+    os.replace(tmp_path, out_path)
+    prune_report_cache()
+
+    return pdf_response(out_path, etag)
@@ -1,15 +1,21 @@
 import argparse
 import datetime as dt
-import json
-from typing import Any, Dict, List
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
 
+import orjson
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import (
+    Flowable,
     SimpleDocTemplate,
     Paragraph,
     Spacer,
@@ -20,22 +26,105 @@ from reportlab.platypus import (
 
 API_BASE = "http://127.0.0.1:8000"
 
+# One keep-alive session for all API calls, so /incidents and /rca share a
+# pooled connection instead of each opening (and tearing down) its own.
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+
+# ---------------------------------------------------
+# Report styles (built once; treated as read-only)
+# ---------------------------------------------------
+def ensure_styles():
+    styles = getSampleStyleSheet()
+    styles.add(
+        ParagraphStyle(
+            name="TitleBig",
+            parent=styles["Title"],
+            fontSize=20,
+            leading=24,
+            spaceAfter=12,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="SectionHeader",
+            parent=styles["Heading2"],
+            fontSize=14,
+            leading=18,
+            spaceBefore=12,
+            spaceAfter=6,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="BodySmall",
+            parent=styles["Normal"],
+            fontSize=9,
+            leading=12,
+        )
+    )
+    return styles
+
+
+STYLES = ensure_styles()
+
+# rows per reportlab Table in the incident summary
+TABLE_CHUNK_ROWS = 100
+
+INCIDENT_TABLE_STYLE = TableStyle(
+    [
+        # Header style
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#003366")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 9),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
+        # Body style
+        ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 1), (-1, -1), 8),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("ALIGN", (0, 1), (0, -1), "LEFT"),
+        ("ALIGN", (1, 1), (-1, -1), "LEFT"),
+        # Grid
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+    ]
+)
+
 
 # ---------------------------------------------------
 # Helpers to call your own API
 # ---------------------------------------------------
-def fetch_incidents() -> Dict[str, Any]:
-    """Call /incidents from the local API."""
-    resp = requests.get(f"{API_BASE}/incidents", params={"force_run": "true"}, timeout=60)
+def fetch_incidents(force: bool = False) -> Dict[str, Any]:
+    """
+    Call /incidents from the local API. The server answers from its
+    response cache (rebuilt whenever transactions.csv changes) unless
+    `force` asks it to re-run the detectors.
+    """
+    params = {"force_run": "true"} if force else None
+    resp = SESSION.get(f"{API_BASE}/incidents", params=params, timeout=60)
     resp.raise_for_status()
-    return resp.json()
+    return orjson.loads(resp.content)
 
 
 def fetch_rca() -> Dict[str, Any]:
     """Call /rca from the local API."""
-    resp = requests.get(f"{API_BASE}/rca", timeout=60)
+    resp = SESSION.get(f"{API_BASE}/rca", timeout=60)
     resp.raise_for_status()
-    return resp.json()
+    return orjson.loads(resp.content)
+
+
+def fetch_all(force: bool = False) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Fetch /incidents and /rca (concurrently unless `force`); returns (incidents, rca)."""
+    if force:
+        # /rca must come after the forced run, or it can predate it
+        return fetch_incidents(force) or {}, fetch_rca() or {}
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f_inc = ex.submit(fetch_incidents, force)
+        f_rca = ex.submit(fetch_rca)
+        return f_inc.result() or {}, f_rca.result() or {}
 
 
 # ---------------------------------------------------
@@ -43,7 +132,8 @@ def fetch_rca() -> Dict[str, Any]:
 # ---------------------------------------------------
 def flatten_incidents(incidents_json: Dict[str, Any]) -> pd.DataFrame:
     """
-    Turn incidents JSON into a flat DataFrame.
+    Turn an incidents payload (decoded /incidents JSON, or the API's
+    in-process payload) into a flat DataFrame.
 
     Columns:
       - timestamp
@@ -86,7 +176,7 @@ def flatten_incidents(incidents_json: Dict[str, Any]) -> pd.DataFrame:
 
 def flatten_rca(rca_json: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
-    Flatten RCA JSON into a list of dicts:
+    Flatten an RCA payload into a list of dicts:
       - root_cause
       - confidence
       - recommendation
@@ -111,12 +201,36 @@ def flatten_rca(rca_json: Dict[str, Any]) -> List[Dict[str, Any]]:
 # ---------------------------------------------------
 # PDF building
 # ---------------------------------------------------
+def evidence_texts(rca_rows: List[Dict[str, Any]]) -> List[str]:
+    """Serialize every RCA entry's evidence up front, before any flowables are built."""
+    dumps, opt = orjson.dumps, orjson.OPT_INDENT_2
+    return [dumps(rc.get("evidence", {}), default=str, option=opt).decode() for rc in rca_rows]
+
+
+def render_root_cause(
+    idx: int, rc: Dict[str, Any], ev_str: str, styles
+) -> Iterator[Flowable]:
+    """Flowables for one RCA entry in Section 3 (ev_str from evidence_texts)."""
+    yield Paragraph(f"Root Cause #{idx}: <b>{rc['root_cause']}</b>", styles["BodySmall"])
+    yield Paragraph(f"Confidence: {rc['confidence']}", styles["BodySmall"])
+    yield Paragraph(f"Recommendation: {rc['recommendation']}", styles["BodySmall"])
+    yield Paragraph(
+        f"Evidence: <font face='Courier'>{ev_str}</font>",
+        styles["BodySmall"],
+    )
+    yield Spacer(1, 8)
+
+
 def build_pdf(
     out_path: str,
     name: str,
-    incidents_json: Dict[str, Any],
-    rca_json: Dict[str, Any],
+    df_inc: pd.DataFrame,
+    rca_rows: List[Dict[str, Any]],
 ) -> None:
+    """
+    Render the report from flattened incidents (see flatten_incidents) and
+    RCA rows (see flatten_rca).
+    """
     # Document + styles
     doc = SimpleDocTemplate(
         out_path,
@@ -127,34 +241,7 @@ def build_pdf(
         bottomMargin=36,
     )
 
-    styles = getSampleStyleSheet()
-    styles.add(
-        ParagraphStyle(
-            name="TitleBig",
-            parent=styles["Title"],
-            fontSize=20,
-            leading=24,
-            spaceAfter=12,
-        )
-    )
-    styles.add(
-        ParagraphStyle(
-            name="SectionHeader",
-            parent=styles["Heading2"],
-            fontSize=14,
-            leading=18,
-            spaceBefore=12,
-            spaceAfter=6,
-        )
-    )
-    styles.add(
-        ParagraphStyle(
-            name="BodySmall",
-            parent=styles["Normal"],
-            fontSize=9,
-            leading=12,
-        )
-    )
+    styles = STYLES
 
     elements: List[Any] = []
 
@@ -172,7 +259,6 @@ def build_pdf(
     # -------------------------
     # Section 1 – Overview
     # -------------------------
-    df_inc = flatten_incidents(incidents_json)
     total_records = len(df_inc)
 
     if total_records > 0:
@@ -186,17 +272,15 @@ def build_pdf(
         detectors_involved = "N/A"
         time_range_text = "N/A"
 
-    elements.append(Paragraph("Section 1 — Overview", styles["SectionHeader"]))
-    elements.append(
-        Paragraph(f"• Total incident records: <b>{total_records}</b>", styles["BodySmall"])
-    )
-    elements.append(
-        Paragraph(f"• Detectors involved: {detectors_involved}", styles["BodySmall"])
-    )
-    elements.append(
-        Paragraph(f"• Time range (incidents): {time_range_text}", styles["BodySmall"])
+    elements.extend(
+        [
+            Paragraph("Section 1 — Overview", styles["SectionHeader"]),
+            Paragraph(f"• Total incident records: <b>{total_records}</b>", styles["BodySmall"]),
+            Paragraph(f"• Detectors involved: {detectors_involved}", styles["BodySmall"]),
+            Paragraph(f"• Time range (incidents): {time_range_text}", styles["BodySmall"]),
+            Spacer(1, 16),
+        ]
     )
-    elements.append(Spacer(1, 16))
 
     # -------------------------
     # Section 2 – Incident Summary
@@ -220,98 +304,67 @@ def build_pdf(
 
         df_sorted = df_inc.sort_values("timestamp")
 
-        for _, row in df_sorted.iterrows():
-            ts = (
-                row["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
-                if pd.notna(row["timestamp"])
-                else ""
-            )
-
-            failed_parts: List[str] = []
-            if pd.notna(row.get("failed")):
-                failed_parts.append(str(row["failed"]))
-            if pd.notna(row.get("failed_count")):
-                failed_parts.append(str(int(row["failed_count"])))
-            failed_str = " / ".join(failed_parts) if failed_parts else ""
-
-            z = "" if pd.isna(row.get("zscore")) else str(row["zscore"])
-            rev = (
-                "" if pd.isna(row.get("current_revenue")) else f"{row['current_revenue']:.2f}"
-            )
-            base = "" if pd.isna(row.get("baseline")) else f"{row['baseline']:.2f}"
-
-            table_data.append(
-                [
-                    ts,
-                    row.get("detector", "") or "",
-                    row.get("country", "") or "",
-                    failed_str,
-                    z,
-                    rev,
-                    base,
-                ]
-            )
-
-        table = Table(table_data, repeatRows=1)
-
-        table.setStyle(
-            TableStyle(
-                [
-                    # Header style
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#003366")),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                    ("ALIGN", (0, 0), (-1, 0), "CENTER"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), 9),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
-                    # Body style
-                    ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-                    ("FONTSIZE", (0, 1), (-1, -1), 8),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("ALIGN", (0, 1), (0, -1), "LEFT"),
-                    ("ALIGN", (1, 1), (-1, -1), "LEFT"),
-                    # Grid
-                    ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ]
+        # build each display column in one pass instead of per-row iterrows
+        ts = df_sorted["timestamp"].dt.strftime("%Y-%m-%d %H:%M:%S").fillna("")
+        failed = df_sorted["failed"].map(str, na_action="ignore")
+        failed_count = df_sorted["failed_count"].map(
+            lambda v: str(int(v)), na_action="ignore"
+        )
+        failed_str = (
+            (failed + " / " + failed_count).fillna(failed).fillna(failed_count).fillna("")
+        )
+        z = df_sorted["zscore"].map(str, na_action="ignore").fillna("")
+        rev = (
+            df_sorted["current_revenue"].map("{:.2f}".format, na_action="ignore").fillna("")
+        )
+        base = df_sorted["baseline"].map("{:.2f}".format, na_action="ignore").fillna("")
+
+        table_data.extend(
+            list(r)
+            for r in zip(
+                ts,
+                df_sorted["detector"].fillna(""),
+                df_sorted["country"].fillna(""),
+                failed_str,
+                z,
+                rev,
+                base,
             )
         )
 
-        elements.append(table)
-
-    elements.append(Spacer(1, 18))
+        # reportlab's table layout/splitting cost grows faster than the row
+        # count, so long incident lists become several tables of
+        # TABLE_CHUNK_ROWS rows, each with its own header row
+        body = table_data[1:]
+        for start in range(0, len(body), TABLE_CHUNK_ROWS):
+            if start:
+                elements.append(Spacer(1, 6))
+            table = Table([table_header] + body[start:start + TABLE_CHUNK_ROWS], repeatRows=1)
+            table.setStyle(INCIDENT_TABLE_STYLE)
+            elements.append(table)
 
     # -------------------------
     # Section 3 – RCA
     # -------------------------
-    elements.append(
-        Paragraph("Section 3 — Root Cause Analysis (RCA)", styles["SectionHeader"])
+    elements.extend(
+        [
+            Spacer(1, 18),
+            Paragraph("Section 3 — Root Cause Analysis (RCA)", styles["SectionHeader"]),
+        ]
     )
 
-    rca_rows = flatten_rca(rca_json)
     if not rca_rows:
         elements.append(Paragraph("No RCA results available.", styles["BodySmall"]))
     else:
-        for idx, rc in enumerate(rca_rows, start=1):
-            elements.append(
-                Paragraph(f"Root Cause #{idx}: <b>{rc['root_cause']}</b>", styles["BodySmall"])
-            )
-            elements.append(
-                Paragraph(f"Confidence: {rc['confidence']}", styles["BodySmall"])
-            )
-            elements.append(
-                Paragraph(f"Recommendation: {rc['recommendation']}", styles["BodySmall"])
+        ev_texts = evidence_texts(rca_rows)
+        elements.extend(
+            chain.from_iterable(
+                render_root_cause(idx, rc, ev_str, styles)
+                for idx, (rc, ev_str) in enumerate(zip(rca_rows, ev_texts), start=1)
             )
-            ev_str = json.dumps(rc.get("evidence", {}), indent=2)
-            elements.append(
-                Paragraph(
-                    f"Evidence: <font face='Courier'>{ev_str}</font>",
-                    styles["BodySmall"],
-                )
-            )
-            elements.append(Spacer(1, 8))
+        )
 
-    elements.append(Spacer(1, 12))
-    elements.append(Paragraph("End of report.", styles["BodySmall"]))
+    elements.extend([Spacer(1, 12), Paragraph("End of report.", styles["BodySmall"])])
 
     # Build the PDF
     doc.build(elements)
@@ -324,19 +377,29 @@ def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--out", required=True, help="Output PDF path")
     parser.add_argument("--name", default="AOHI User", help="Name for the report")
+    parser.add_argument("--force", action="store_true",
+                        help="Make the API re-run the detectors instead of using its cache")
+    parser.add_argument("--local", action="store_true",
+                        help="Run the detectors in this process instead of calling the API")
     args = parser.parse_args()
 
-    # Fetch data from API
-    incidents_json = fetch_incidents()
-    rca_json = fetch_rca()
+    if args.local:
+        # same in-process path /report_pro uses: no server, no JSON round-trip
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+        from api.fastapi_app import get_incidents_df, get_rca_rows
+
+        df_inc, rca_rows = get_incidents_df(), get_rca_rows()
+    else:
+        # Fetch data from API (both requests in flight at once)
+        incidents_json, rca_json = fetch_all(force=args.force)
+        df_inc, rca_rows = flatten_incidents(incidents_json), flatten_rca(rca_json)
 
     build_pdf(
         out_path=args.out,
         name=args.name,
-        incidents_json=incidents_json,
-        rca_json=rca_json,
+        df_inc=df_inc,
+        rca_rows=rca_rows,
     )
 
-
 if __name__ == "__main__":
     main()
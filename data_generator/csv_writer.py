@@ -0,0 +1,26 @@
+# data_generator/csv_writer.py
+"""
+CSV output shared by the data generators.
+"""
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # optional: plain DataFrame.to_csv is used without it
+    pa = pacsv = None
+
+
+def write_csv(df, path, index=False):
+    # Arrow's C++ writer when available; values are written unquoted, so
+    # anything that would need quoting goes through pandas instead
+    if pacsv is not None and not index:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with open(path, "wb") as fh:
+                fh.write((",".join(df.columns) + "\n").encode("utf-8"))
+                pacsv.write_csv(table, fh, write_options=pacsv.WriteOptions(
+                    include_header=False, quoting_style="none"))
+            return
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    df.to_csv(path, index=index)
@@ -14,11 +14,13 @@ Reproducible via --seed
 
 import argparse
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import random
-import math
+import numpy as np
 import pandas as pd
 
+from data_generator.csv_writer import write_csv
+
 def ensure_dir(path):
     if not os.path.exists(path):
         os.makedirs(path)
@@ -26,121 +28,139 @@ def ensure_dir(path):
 def generate_timestamps(start_dt, periods, freq_seconds):
     return [start_dt + timedelta(seconds=i * freq_seconds) for i in range(periods)]
 
-def gen_transactions(timestamps, seed, inject=None):
-    random.seed(seed)
-    rows = []
-    tx_id = 100000
+def iso_timestamps(timestamps):
+    # formatted once in main() and shared by every generator
+    return np.array([ts.isoformat() for ts in timestamps], dtype=object)
+
+def gen_transactions(timestamps, rng, inject=None, iso=None):
+    rng = np.random.default_rng(rng)
     base_amount = 50.0
-    for ts in timestamps:
-        count = random.choice([0, 1, 1, 2, 3])
-        for _ in range(count):
-            tx_id += 1
-            amount = round(base_amount * (0.5 + random.random()*2.0), 2)
-            status = "success" if random.random() > 0.01 else "failed"
-            rows.append({
-                "timestamp": ts.isoformat(),
-                "tx_id": tx_id,
-                "amount": amount,
-                "country": random.choice(["IN","US","UK","DE"]),
-                "product_id": random.randint(100,130),
-                "status": status
-            })
-
-    df = pd.DataFrame(rows)
+    if iso is None:
+        iso = iso_timestamps(timestamps)
+
+    # 0-3 transactions per timestamp, then every column drawn in one go
+    counts = rng.choice([0, 1, 1, 2, 3], size=len(timestamps))
+    total = int(counts.sum())
+    df = pd.DataFrame({
+        "timestamp": np.repeat(iso, counts),
+        "tx_id": np.arange(100001, 100001 + total),
+        "amount": np.round(base_amount * (0.5 + rng.random(total)*2.0), 2),
+        "country": rng.choice(["IN","US","UK","DE"], size=total),
+        "product_id": rng.integers(100, 131, size=total),
+        "status": np.where(rng.random(total) > 0.01, "success", "failed"),
+    })
     if inject == "spike_failed_tx":
         mid = len(timestamps)//2
-        extras = []
-        for i in range(mid, mid+10):
-            ts = timestamps[i].isoformat()
-            for j in range(20):
-                tx_id += 1
-                extras.append({
-                    "timestamp": ts,
-                    "tx_id": tx_id,
-                    "amount": round(base_amount * (0.5 + random.random()*2.0), 2),
-                    "country": "IN",
-                    "product_id": random.randint(100,130),
-                    "status": "failed"
-                })
-        if extras:
-            df = pd.concat([df, pd.DataFrame(extras)], ignore_index=True)
+        # 20 failed IN transactions in each of the 10 buckets after mid
+        ts = np.repeat(iso[mid:mid+10], 20)
+        n = len(ts)
+        extras = pd.DataFrame({
+            "timestamp": ts,
+            "tx_id": np.arange(100001 + total, 100001 + total + n),
+            "amount": np.round(base_amount * (0.5 + rng.random(n)*2.0), 2),
+            "country": "IN",
+            "product_id": rng.integers(100, 131, size=n),
+            "status": "failed",
+        })
+        if n:
+            df = pd.concat([df, extras], ignore_index=True)
     return df
 
-def gen_web_traffic(timestamps, seed, inject=None):
-    random.seed(seed+1)
-    rows = []
-    start = timestamps[0]
-    for ts in timestamps:
-        secs = (ts - start).total_seconds()
-        day_seconds = 24*3600
-        daily = 100 + 50 * math.sin(2 * math.pi * (secs % day_seconds) / day_seconds)
-        noise = random.gauss(0, 5)
-        sessions = max(1, int(daily + noise))
-        rows.append({"timestamp": ts.isoformat(), "page": "/home", "sessions": sessions, "users": max(1, int(sessions*0.7))})
-    df = pd.DataFrame(rows)
+def gen_web_traffic(timestamps, rng, inject=None, iso=None):
+    rng = np.random.default_rng(rng)
+    idx = pd.DatetimeIndex(timestamps)
+    secs = (idx - idx[0]).total_seconds().to_numpy()
+    day_seconds = 24*3600
+    daily = 100 + 50 * np.sin(2 * np.pi * (secs % day_seconds) / day_seconds)
+    noise = rng.normal(0, 5, size=len(secs))
+    sessions = np.maximum(1, (daily + noise).astype(int))
+    df = pd.DataFrame({
+        "timestamp": iso_timestamps(timestamps) if iso is None else iso,
+        "page": "/home",
+        "sessions": sessions,
+        "users": np.maximum(1, (sessions*0.7).astype(int)),
+    })
     if inject == "traffic_drop":
         mid = len(timestamps)//3
-        for i in range(mid, min(mid+8, len(df))):
-            df.at[i, "sessions"] = int(df.at[i, "sessions"] * 0.2)
+        drop = df.loc[mid:mid+7, "sessions"]
+        df.loc[drop.index, "sessions"] = (drop * 0.2).astype(int)
     return df
 
-def gen_system_metrics(timestamps, seed, inject=None):
-    random.seed(seed+2)
-    rows = []
-    for ts in timestamps:
-        cpu = max(1.0, min(99.0, 20 + random.random()*15))
-        mem = max(10.0, min(95.0, 30 + random.random()*20))
-        latency = max(10.0, min(200.0, 50 + random.random()*40))
-        rows.append({"timestamp": ts.isoformat(), "host": "app01", "cpu": round(cpu,2), "mem": round(mem,2), "latency_ms": round(latency,2)})
-    df = pd.DataFrame(rows)
+def gen_system_metrics(timestamps, rng, inject=None, iso=None):
+    rng = np.random.default_rng(rng)
+    n = len(timestamps)
+    df = pd.DataFrame({
+        "timestamp": iso_timestamps(timestamps) if iso is None else iso,
+        "host": "app01",
+        "cpu": np.clip(20 + rng.random(n)*15, 1.0, 99.0).round(2),
+        "mem": np.clip(30 + rng.random(n)*20, 10.0, 95.0).round(2),
+        "latency_ms": np.clip(50 + rng.random(n)*40, 10.0, 200.0).round(2),
+    })
     if inject == "latency_drift":
         start = len(timestamps)//4
-        for i in range(start, min(start+30, len(df))):
-            df.at[i, "latency_ms"] = df.at[i, "latency_ms"] * (1 + 0.05 * (i - start))
+        drift = df.loc[start:start+29, "latency_ms"]
+        df.loc[drift.index, "latency_ms"] = drift * (1 + 0.05 * np.arange(len(drift)))
     return df
 
-def gen_crm_events(timestamps, seed, inject=None):
-    random.seed(seed+3)
-    rows = []
-    uid = 2000
-    for ts in timestamps:
-        if random.random() < 0.05:
-            uid += 1
-            ev = random.choice(["signup","login","purchase","support_ticket"])
-            rows.append({"timestamp": ts.isoformat(), "user_id": uid, "event_type": ev, "support_ticket": 1 if ev=="support_ticket" else 0})
-    df = pd.DataFrame(rows)
+def gen_crm_events(timestamps, rng, inject=None, iso=None):
+    rng = np.random.default_rng(rng)
+    if iso is None:
+        iso = iso_timestamps(timestamps)
+    # an event at ~5% of timestamps; user ids are consecutive from 2001
+    ts_col = iso[rng.random(len(iso)) < 0.05]
+    events = rng.choice(np.array(["signup","login","purchase","support_ticket"], dtype=object),
+                        size=len(ts_col))
+    uid = 2001 + len(events)
+    df = pd.DataFrame({
+        "timestamp": ts_col,
+        "user_id": np.arange(2001, uid),
+        "event_type": events,
+        "support_ticket": (events == "support_ticket").astype(np.int64),
+    })
     if inject == "support_surge":
         mid = len(timestamps)//2
-        extras = []
-        for i in range(mid, min(mid+5, len(timestamps))):
-            for j in range(10):
-                uid += 1
-                extras.append({"timestamp": timestamps[i].isoformat(), "user_id": uid, "event_type": "support_ticket", "support_ticket":1})
-        if extras:
-            df = pd.concat([df, pd.DataFrame(extras)], ignore_index=True)
+        # 10 support tickets in each of the 5 timestamps after mid
+        ts = np.repeat(iso[mid:mid+5], 10)
+        n = len(ts)
+        extras = pd.DataFrame({
+            "timestamp": ts,
+            "user_id": np.arange(uid, uid + n),
+            "event_type": "support_ticket",
+            "support_ticket": 1,
+        })
+        if n:
+            df = pd.concat([df, extras], ignore_index=True)
     return df
 
-def write_csv(df, path):
-    df.to_csv(path, index=False)
-
 def main(output_dir, seed, inject):
     ensure_dir(output_dir)
     start = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=24)
     timestamps = generate_timestamps(start, periods=288, freq_seconds=300)
+    iso = iso_timestamps(timestamps)
+
+    # one independent PCG64 stream per generator, all derived from --seed, so
+    # the four files can be generated and written side by side; NumPy and the
+    # Arrow CSV writer release the GIL for most of the work
+    jobs = [
+        ("transactions.csv", gen_transactions, "spike_failed_tx"),
+        ("web_traffic.csv", gen_web_traffic, "traffic_drop"),
+        ("system_metrics.csv", gen_system_metrics, "latency_drift"),
+        ("crm_events.csv", gen_crm_events, "support_surge"),
+    ]
+
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(len(jobs))]
 
-    tx = gen_transactions(timestamps, seed, inject="spike_failed_tx" if inject=="spike_failed_tx" else None)
-    wt = gen_web_traffic(timestamps, seed, inject="traffic_drop" if inject=="traffic_drop" else None)
-    sysm = gen_system_metrics(timestamps, seed, inject="latency_drift" if inject=="latency_drift" else None)
-    crm = gen_crm_events(timestamps, seed, inject="support_surge" if inject=="support_surge" else None)
+    def run(fname, gen, anomaly, rng):
+        df = gen(timestamps, rng, inject=anomaly if inject==anomaly else None, iso=iso)
+        write_csv(df, os.path.join(output_dir, fname))
 
-    write_csv(tx, os.path.join(output_dir, "transactions.csv"))
-    write_csv(wt, os.path.join(output_dir, "web_traffic.csv"))
-    write_csv(sysm, os.path.join(output_dir, "system_metrics.csv"))
-    write_csv(crm, os.path.join(output_dir, "crm_events.csv"))
+    with ThreadPoolExecutor(max_workers=len(jobs)) as ex:
+        for fut in [ex.submit(run, *job, rng) for job, rng in zip(jobs, rngs)]:
+            fut.result()
 
     print(f"Generated files in {output_dir}:")
-    for f in ["transactions.csv","web_traffic.csv","system_metrics.csv","crm_events.csv"]:
-        print(" -", f)
+    for fname, _, _ in jobs:
+        print(" -", fname)
 
 if __name__ == "__main__":
     import argparse
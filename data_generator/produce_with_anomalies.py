@@ -11,10 +11,13 @@ python -m data_generator.produce_with_anomalies
 import random
 import csv
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 import os
 import math
 
+from data_generator.csv_writer import write_csv
+
 OUT_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 os.makedirs(OUT_DIR, exist_ok=True)
 
@@ -24,75 +27,93 @@ def base_time():
 
 def generate_transactions(start, minutes=24*24, seed=42):
     random.seed(seed)
-    rows = []
-    tx_id = 100000
+    # column lists instead of per-row dicts (same draw order as before)
+    counts, amounts, countries, products = [], [], [], []
     for m in range(minutes):
-        ts = start + timedelta(minutes=m)
         # variable number of transactions per minute
         n = random.choice([0,1,2,3,4])
+        counts.append(n)
         for i in range(n):
-            tx_id += 1
-            amount = round(random.uniform(10, 120), 2)
-            country = random.choices(["IN","UK","DE","US"], weights=[0.6,0.15,0.15,0.1])[0]
-            status = "success"
-            rows.append({"timestamp": ts.isoformat(), "tx_id": tx_id, "amount": amount, "country": country, "product_id": random.randint(100,130), "status": status})
-    return pd.DataFrame(rows)
+            amounts.append(round(random.uniform(10, 120), 2))
+            countries.append(random.choices(["IN","UK","DE","US"], weights=[0.6,0.15,0.15,0.1])[0])
+            products.append(random.randint(100,130))
+    iso = np.array([(start + timedelta(minutes=m)).isoformat() for m in range(minutes)], dtype=object)
+    total = len(amounts)
+    return pd.DataFrame({
+        "timestamp": np.repeat(iso, counts),
+        "tx_id": np.arange(100001, 100001 + total),
+        "amount": np.array(amounts, dtype=np.float64),
+        "country": np.array(countries, dtype=object),
+        "product_id": np.array(products, dtype=np.int64),
+        "status": "success",
+    })
 
 def inject_geo_failures(tx_df, start_bucket, duration_minutes=60, country="IN", failed_per_bucket=20):
     # For each 5-min bucket in window, add failed transactions for the country
     # We'll add rows that have status 'failed'
-    rows = []
-    buckets = [start_bucket + timedelta(minutes=5*i) for i in range(duration_minutes//5)]
+    buckets = [(start_bucket + timedelta(minutes=5*i)).isoformat() for i in range(duration_minutes//5)]
     tx_id = int(tx_df["tx_id"].max()) if not tx_df.empty else 200000
-    for b in buckets:
-        for _ in range(failed_per_bucket):
-            tx_id += 1
-            rows.append({
-                "timestamp": b.isoformat(),
-                "tx_id": tx_id,
-                "amount": round(random.uniform(20,140),2),
-                "country": country,
-                "product_id": random.randint(100,130),
-                "status":"failed"
-            })
-    if rows:
-        return pd.concat([tx_df, pd.DataFrame(rows)], ignore_index=True)
-    return tx_df
+    n = len(buckets) * failed_per_bucket
+    if not n:
+        return tx_df
+    # typed columns filled in the original draw order (amount, product per row)
+    amounts = np.empty(n, dtype=np.float64)
+    products = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        amounts[i] = round(random.uniform(20,140),2)
+        products[i] = random.randint(100,130)
+    rows = pd.DataFrame({
+        "timestamp": np.repeat(np.array(buckets, dtype=object), failed_per_bucket),
+        "tx_id": np.arange(tx_id + 1, tx_id + 1 + n),
+        "amount": amounts,
+        "country": country,
+        "product_id": products,
+        "status": "failed",
+    })
+    return pd.concat([tx_df, rows], ignore_index=True)
 
 def inject_revenue_drop(tx_df, start_bucket, duration_hours=2, reduce_by=0.1):
     # For the given hourly buckets, reduce revenue by converting many success -> failed or reducing amount
-    df = tx_df.copy()
+    # (modifies tx_df in place and returns it; callers reassign the result)
+    df = tx_df
     start = start_bucket
     end = start + timedelta(hours=duration_hours)
-    mask = (pd.to_datetime(df["timestamp"]) >= start) & (pd.to_datetime(df["timestamp"]) < end)
+    # parse the timestamps once and work on plain boolean arrays
+    ts = pd.to_datetime(df["timestamp"])
+    mask = ((ts >= start) & (ts < end)).to_numpy()
+    status = df["status"].to_numpy(copy=True)
     # randomly set some successes to failed to simulate checkout failures
-    idxs = df[mask & (df["status"]=="success")].sample(frac=0.7, replace=False).index if mask.any() else []
-    df.loc[idxs, "status"] = "failed"
+    succ = np.flatnonzero(mask & (status == "success"))
+    status[random.sample(list(succ), k=round(len(succ) * 0.7))] = "failed"
+    df["status"] = status
     # also optionally reduce amounts of remaining successes
-    df.loc[mask & (df["status"]=="success"), "amount"] = (df.loc[mask & (df["status"]=="success"), "amount"] * reduce_by).round(2)
+    keep = mask & (status == "success")
+    df.loc[keep, "amount"] = (df.loc[keep, "amount"] * reduce_by).round(2)
     return df
 
 def generate_system_metrics(start, minutes=24*24, seed=123):
     random.seed(seed)
-    rows = []
+    latency = np.empty(minutes, dtype=np.float64)
+    cpu = np.empty(minutes, dtype=np.float64)
     for m in range(minutes):
-        ts = start + timedelta(minutes=m)
-        latency = random.uniform(50, 120)  # baseline ms
-        cpu = random.uniform(10, 60)
-        rows.append({"timestamp": ts.isoformat(), "latency_ms": latency, "cpu": cpu})
-    return pd.DataFrame(rows)
+        latency[m] = random.uniform(50, 120)  # baseline ms
+        cpu[m] = random.uniform(10, 60)
+    return pd.DataFrame({
+        "timestamp": [(start + timedelta(minutes=m)).isoformat() for m in range(minutes)],
+        "latency_ms": latency,
+        "cpu": cpu,
+    })
 
 def inject_latency_spike(sys_df, spike_start, duration_minutes=30, multiplier=6):
-    df = sys_df.copy()
+    # modifies sys_df in place and returns it
+    df = sys_df
     start = spike_start
     end = spike_start + timedelta(minutes=duration_minutes)
-    mask = (pd.to_datetime(df["timestamp"]) >= start) & (pd.to_datetime(df["timestamp"]) < end)
+    ts = pd.to_datetime(df["timestamp"])
+    mask = (ts >= start) & (ts < end)
     df.loc[mask, "latency_ms"] = df.loc[mask, "latency_ms"] * multiplier
     return df
 
-def save_csv(df, path, index=False):
-    df.to_csv(path, index=index)
-
 def main():
     start = base_time()
     print("Generating base transactions and system metrics...")
@@ -118,10 +139,10 @@ def main():
     web = pd.DataFrame([{"timestamp": (start + timedelta(minutes=i*10)).isoformat(), "visitors": random.randint(10,400)} for i in range(144)])
 
     # write files
-    save_csv(tx, os.path.join(OUT_DIR, "transactions.csv"), index=False)
-    save_csv(sysm, os.path.join(OUT_DIR, "system_metrics.csv"), index=False)
-    save_csv(crm, os.path.join(OUT_DIR, "crm_events.csv"), index=False)
-    save_csv(web, os.path.join(OUT_DIR, "web_traffic.csv"), index=False)
+    write_csv(tx, os.path.join(OUT_DIR, "transactions.csv"), index=False)
+    write_csv(sysm, os.path.join(OUT_DIR, "system_metrics.csv"), index=False)
+    write_csv(crm, os.path.join(OUT_DIR, "crm_events.csv"), index=False)
+    write_csv(web, os.path.join(OUT_DIR, "web_traffic.csv"), index=False)
 
     print("Files written to", OUT_DIR)
     print("transactions rows:", len(tx))
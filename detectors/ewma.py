@@ -9,34 +9,92 @@ Functions:
                       span=6, k=3, min_failed=5)
 """
 
+import math
+
 import pandas as pd
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the pandas implementation is used instead
+    njit = None
+
+from detectors.loader import count_failed_buckets, iso_seconds, load_failed_buckets
+
+COLUMNS = ("timestamp", "status")
+
+def _ewma_score_kernel(x, span, window):
+    """
+    EWMA of x (adjust=False), rolling std (ddof=1) of the previous `window`
+    residuals and the resulting |resid| / std score, as one loop over a
+    float64 array. Mirrors the pandas version in detect_ewma_failed: the
+    first `window` points use the std of all residuals, a zero std counts
+    as 1.0.
+    """
+    n = x.size
+    alpha = 2.0 / (span + 1.0)
+    ewma = np.empty(n)
+    resid = np.empty(n)
+    w = x[0]
+    for i in range(n):
+        if i > 0 and w != x[i]:
+            w = ((1.0 - alpha) * w + alpha * x[i]) / ((1.0 - alpha) + alpha)
+        ewma[i] = w
+        resid[i] = x[i] - w
+
+    # fallback std for the warm-up points (NaN for a single bucket, like pandas)
+    full_std = np.nan
+    if n > 1:
+        mean = resid.sum() / n
+        full_std = math.sqrt(((resid - mean) ** 2).sum() / (n - 1))
+
+    roll_std = np.empty(n)
+    score = np.empty(n)
+    for i in range(n):
+        if i < window:
+            std = full_std
+        else:
+            win = resid[i - window:i]
+            if win.min() == win.max():
+                std = 0.0
+            else:
+                mean = win.sum() / window
+                std = math.sqrt(((win - mean) ** 2).sum() / (window - 1))
+        roll_std[i] = std
+        score[i] = abs(resid[i]) / (1.0 if std == 0.0 else std)
+    return ewma, roll_std, score
+
+ewma_score = njit(cache=True)(_ewma_score_kernel) if njit is not None else None
+
 def compute_failed_buckets(df, ts_col='timestamp', status_col='status', freq='5T'):
-    df[ts_col] = pd.to_datetime(df[ts_col])
-    df['bucket'] = df[ts_col].dt.floor(freq)
-    failed = df[df[status_col] != 'success'].groupby('bucket').size().rename('failed_count')
-    total = df.groupby('bucket').size().rename('total_count')
-    agg = pd.concat([total, failed], axis=1).fillna(0)
-    agg['failed_count'] = agg['failed_count'].astype(int)
-    return agg
+    if not pd.api.types.is_datetime64_any_dtype(df[ts_col]):
+        df = df.assign(**{ts_col: pd.to_datetime(df[ts_col])})
+    return count_failed_buckets(df, ts_col, status_col, freq)
 
 def detect_ewma_failed(csv_path, ts_col='timestamp', status_col='status', freq='5T',
-                       span=6, k=3, min_failed=5):
-    df = pd.read_csv(csv_path, parse_dates=[ts_col])
-    if df.empty:
+                       span=6, k=3, min_failed=5, df=None):
+    # per-bucket counts: shared with the seasonal detector through the loader
+    # cache, unless the caller passes an already loaded frame
+    if df is None:
+        agg = load_failed_buckets(csv_path, ts_col, status_col, freq)
+    else:
+        agg = compute_failed_buckets(df, ts_col, status_col, freq)
+    if agg.empty:
         print("No transactions found.")
         return []
 
-    agg = compute_failed_buckets(df, ts_col, status_col, freq)
-
-    # EWMA (pandas ewm). Use span (smoothing) and adjust=False for classic EWMA
-    ewma = agg['failed_count'].ewm(span=span, adjust=False).mean()
-    # approximate std of residuals using rolling std on residuals
-    resid = agg['failed_count'] - ewma
-    # use rolling window for std estimation (span*2 or 10)
-    roll_std = resid.shift(1).rolling(window=max(3, span)).std().fillna(resid.std() if not resid.empty else 1.0)
-    score = (agg['failed_count'] - ewma).abs() / (roll_std.replace(0, 1.0))
+    if ewma_score is not None:
+        # compiled kernel over the raw counts (numba installed)
+        x = agg['failed_count'].to_numpy(dtype=np.float64)
+        ewma, roll_std, score = ewma_score(x, float(span), max(3, span))
+    else:
+        # EWMA (pandas ewm). Use span (smoothing) and adjust=False for classic EWMA
+        ewma = agg['failed_count'].ewm(span=span, adjust=False).mean()
+        # approximate std of residuals using rolling std on residuals
+        resid = agg['failed_count'] - ewma
+        # use rolling window for std estimation (span*2 or 10)
+        roll_std = resid.shift(1).rolling(window=max(3, span)).std().fillna(resid.std() if not resid.empty else 1.0)
+        score = (agg['failed_count'] - ewma).abs() / (roll_std.replace(0, 1.0))
 
     agg['ewma'] = ewma
     agg['resid_std'] = roll_std
@@ -50,9 +108,12 @@ def detect_ewma_failed(csv_path, ts_col='timestamp', status_col='status', freq='
 
     results = []
     print("\nEWMA anomalies detected:")
-    for idx, row in anomalies.iterrows():
-        print(f" - {idx} failed={int(row['failed_count'])} score={row['score']:.2f}")
-        results.append({"timestamp": idx.isoformat(), "failed": int(row['failed_count']), "score": float(row['score'])})
+    for idx, iso, failed, score in zip(anomalies.index,
+                                       iso_seconds(anomalies.index),
+                                       anomalies['failed_count'].to_numpy(),
+                                       anomalies['score'].to_numpy()):
+        print(f" - {idx} failed={int(failed)} score={score:.2f}")
+        results.append({"timestamp": iso, "failed": int(failed), "score": float(score)})
     return results
 
 if __name__ == "__main__":
@@ -8,11 +8,15 @@ error. This keeps the API logs clean and avoids stack traces.
 
 from __future__ import annotations
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 import pandas as pd
 import numpy as np
 
+from detectors.loader import ROLLING_ENGINE, iso_seconds, load_transactions
+
+COLUMNS = ("timestamp", "latency_ms")
+
 
 def detect_latency_spike(
     csv_path: str,
@@ -22,6 +26,7 @@ def detect_latency_spike(
     window: int = 6,
     z_thresh: float = 2.5,
     min_count: int = 10,
+    df: Optional[pd.DataFrame] = None,
 ) -> List[Dict[str, Any]]:
     """
     Detect latency spikes using a rolling z-score on median latency.
@@ -35,8 +40,10 @@ def detect_latency_spike(
     }
 
     If `latency_ms` is missing, returns [] and prints a small message.
+    Pass `df` to reuse an already loaded frame instead of reading csv_path.
     """
-    df = pd.read_csv(csv_path, parse_dates=[ts_col])
+    if df is None:
+        df = load_transactions(csv_path, ts_col, columns=(latency_col,))
     if df.empty:
         print("No transactions found for latency detector.")
         return []
@@ -46,12 +53,11 @@ def detect_latency_spike(
         print(f"No latency column '{latency_col}' found; skipping latency detector.")
         return []
 
-    # Bucket into time windows
-    df["bucket"] = df[ts_col].dt.floor(freq)
-
-    # Aggregate median latency + count
+    # Bucket into time windows and aggregate median latency + count; the
+    # floored timestamps are the group key, not a column added to the frame
+    bucket = df[ts_col].dt.floor(freq).rename("bucket")
     agg = (
-        df.groupby("bucket")[latency_col]
+        df[latency_col].groupby(bucket)
         .agg(["median", "count"])
         .rename(columns={"median": "latency_median", "count": "count"})
     )
@@ -60,9 +66,10 @@ def detect_latency_spike(
         print("No latency data after aggregation.")
         return []
 
-    # Rolling stats
-    agg["rolling_mean"] = agg["latency_median"].shift(1).rolling(window=window, min_periods=1).mean()
-    agg["rolling_std"] = agg["latency_median"].shift(1).rolling(window=window, min_periods=1).std().fillna(1.0)
+    # Rolling stats (one shifted window for both)
+    prior = agg["latency_median"].shift(1).rolling(window=window, min_periods=1)
+    agg["rolling_mean"] = prior.mean(**ROLLING_ENGINE)
+    agg["rolling_std"] = prior.std(**ROLLING_ENGINE).fillna(1.0)
 
     # Z-score
     agg["zscore"] = (agg["latency_median"] - agg["rolling_mean"]) / agg["rolling_std"]
@@ -76,17 +83,20 @@ def detect_latency_spike(
 
     results: List[Dict[str, Any]] = []
     print("\nLatency anomalies detected:")
-    for ts, row in anomalies.iterrows():
-        print(
-            f" - {ts} median={row['latency_median']:.2f}ms "
-            f"z={row['zscore']:.2f} count={int(row['count'])}"
-        )
+    for ts, iso, median, z, count in zip(
+        anomalies.index,
+        iso_seconds(anomalies.index),
+        anomalies["latency_median"].to_numpy(),
+        anomalies["zscore"].to_numpy(),
+        anomalies["count"].to_numpy(),
+    ):
+        print(f" - {ts} median={median:.2f}ms z={z:.2f} count={int(count)}")
         results.append(
             {
-                "timestamp": ts.isoformat(),
-                "latency_median": float(row["latency_median"]),
-                "zscore": float(row["zscore"]),
-                "count": int(row["count"]),
+                "timestamp": iso,
+                "latency_median": float(median),
+                "zscore": float(z),
+                "count": int(count),
             }
         )
 
@@ -0,0 +1,229 @@
+# detectors/loader.py
+"""
+Shared CSV loader for the detectors.
+
+Every detector reads the same transactions.csv, and the API runs all of them on
+each /incidents and /rca hit. The parsed frame is cached per
+(path, mtime, size, ts_col) in a small LRU, so repeated calls only re-parse
+when the file changes on disk, and stale versions age out.
+
+Parsing uses pyarrow's multithreaded CSV reader when pyarrow is installed
+(timestamps are parsed natively by Arrow), falling back to pandas' C engine
+when it isn't or when the file doesn't fit the expected schema. If a
+Parquet copy sits next to the CSV (tools/csv_to_parquet.py) and is at least
+as new, it is read instead; a .parquet path is read directly.
+Low-cardinality text columns are stored as categoricals, which makes the
+status filters and country groupbys cheaper.
+
+Only the columns some detector needs are parsed: each detector module
+advertises them in a module-level COLUMNS tuple, and callers using other
+column names (e.g. country_col='region') pass them as `columns`. Files larger than
+CHUNK_THRESHOLD are read in CHUNK_SIZE-row chunks with explicit dtypes, so
+the parser never holds a whole file's worth of untyped strings at once.
+
+Callers get a shallow copy of the cached frame: adding or replacing columns
+(e.g. 'bucket') is fine, modifying values in place is not.
+
+The per-bucket total/failed counts that the EWMA and seasonal detectors both
+start from are cached the same way (per file version and bucket frequency),
+so running both only buckets the file once.
+"""
+
+import csv
+import functools
+import importlib
+import os
+import pkgutil
+import threading
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pacsv = pq = None
+
+try:
+    import numba  # only needed for pandas' engine="numba"
+except ImportError:
+    numba = None
+
+CATEGORY_COLUMNS = ("status", "country")
+DTYPES = {"status": "category", "country": "category", "amount": "float64"}
+
+CHUNK_SIZE = 200_000
+CHUNK_THRESHOLD = int(os.getenv("AOHI_CSV_CHUNK_BYTES", str(64 << 20)))
+
+# pandas' numba engine for the latency/revenue rolling stats (nogil, so
+# concurrent detectors don't serialize on it). Opt-in: it compiles on first use
+# in every process, which only pays off in a long-running API, so warm it up
+# right away.
+ROLLING_ENGINE = (
+    {"engine": "numba", "engine_kwargs": {"nopython": True, "nogil": True}}
+    if numba is not None and os.getenv("AOHI_NUMBA_ROLLING") == "1"
+    else {}
+)
+if ROLLING_ENGINE:
+    _warm = pd.Series([0.0, 1.0]).rolling(2, min_periods=1)
+    _warm.mean(**ROLLING_ENGINE), _warm.std(**ROLLING_ENGINE), _warm.median(**ROLLING_ENGINE)
+
+_TX_LOCK = threading.Lock()
+_AGG_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def needed_columns():
+    """
+    Union of the COLUMNS advertised by the detector modules, or None (read
+    everything) if a detector module doesn't say what it uses.
+    """
+    cols = set()
+    pkg_dir = os.path.dirname(os.path.abspath(__file__))
+    for _, name, _ in pkgutil.iter_modules([pkg_dir]):
+        if name == "loader" or name.startswith("run_"):
+            continue
+        mod = importlib.import_module(f"detectors.{name}")
+        if not hasattr(mod, "COLUMNS"):
+            return None
+        cols.update(mod.COLUMNS)
+    return frozenset(cols)
+
+
+def read_arrow_csv(csv_path, ts_col, wanted):
+    """Read with pyarrow.csv: only the wanted columns, timestamps as ns."""
+    with open(csv_path, newline="") as fh:
+        header = next(csv.reader(fh), [])
+    include = [c for c in header if wanted(c)]
+    types = {ts_col: pa.timestamp("ns"), "amount": pa.float64()}
+    table = pacsv.read_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(block_size=8 << 20),
+        convert_options=pacsv.ConvertOptions(
+            column_types={c: t for c, t in types.items() if c in include},
+            include_columns=include,
+            strings_can_be_null=True,  # blank cells are NaN, as with pandas
+        ),
+    )
+    return table.to_pandas()
+
+
+def parquet_copy(csv_path):
+    """The .parquet file next to csv_path, if there is one at least as new."""
+    pq_path = os.path.splitext(csv_path)[0] + ".parquet"
+    try:
+        if os.stat(pq_path).st_mtime_ns >= os.stat(csv_path).st_mtime_ns:
+            return pq_path
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def read_parquet(pq_path, wanted):
+    """Read only the wanted columns (Parquet prunes them on disk)."""
+    include = [c for c in pq.read_schema(pq_path).names if wanted(c)]
+    table = pq.read_table(pq_path, columns=include)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def read_transactions_csv(csv_path, ts_col="timestamp", columns=()):
+    cols = needed_columns()
+    # a callable tolerates columns the file doesn't have (e.g. latency_ms)
+    wanted = ((lambda c: True) if cols is None
+              else (lambda c: c == ts_col or c in cols or c in columns))
+    kwargs = {"parse_dates": [ts_col], "dtype": DTYPES, "usecols": wanted}
+
+    pq_path = None
+    if pq is not None:
+        pq_path = csv_path if csv_path.endswith(".parquet") else parquet_copy(csv_path)
+
+    if pq_path is not None:
+        df = read_parquet(pq_path, wanted)
+    elif os.path.getsize(csv_path) > CHUNK_THRESHOLD:
+        # chunked reads go through the C engine; typed chunks keep peak memory flat
+        df = pd.concat(pd.read_csv(csv_path, chunksize=CHUNK_SIZE, **kwargs),
+                       ignore_index=True)
+    else:
+        try:
+            if pacsv is None:
+                df = pd.read_csv(csv_path, **kwargs)
+            else:
+                df = read_arrow_csv(csv_path, ts_col, wanted)
+        except Exception:
+            if pacsv is None:
+                raise
+            # Arrow is stricter about mixed timestamp formats; let pandas cope
+            df = pd.read_csv(csv_path, **kwargs)
+
+    # whichever reader ran, keep the usual ns unit (and any tz it parsed)
+    if pd.api.types.is_datetime64_any_dtype(df[ts_col]):
+        df[ts_col] = df[ts_col].dt.as_unit("ns")
+    # concatenated chunks with different categories come back as object
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and df[col].dtype != "category":
+            df[col] = df[col].astype("category")
+    return df
+
+
+@functools.lru_cache(maxsize=4)
+def _load_cached(path, mtime_ns, size, ts_col, columns):
+    # mtime_ns/size are only part of the key: a changed file is a new entry
+    return read_transactions_csv(path, ts_col, columns)
+
+
+def load_transactions(csv_path="data/transactions.csv", ts_col="timestamp", columns=()):
+    """
+    `columns` names any columns the caller needs beyond the detectors'
+    COLUMNS; calls that only need those share one cache entry.
+    """
+    st = os.stat(csv_path)
+    path = os.path.abspath(csv_path)
+    cols = needed_columns()
+    extra = () if cols is None else tuple(sorted(set(columns) - cols))
+
+    # detectors may run concurrently: parse once, let the others wait for it
+    with _TX_LOCK:
+        df = _load_cached(path, st.st_mtime_ns, st.st_size, ts_col, extra)
+    return df.copy(deep=False)
+
+
+def iso_seconds(values):
+    """
+    ISO-8601 strings ('2025-12-05T03:00:00') for whole-second timestamps such
+    as bucket starts: the same text as Timestamp.isoformat(), formatted by
+    numpy in one call instead of one isoformat() per value. tz-aware values
+    keep isoformat() so their offset isn't lost.
+    """
+    values = pd.DatetimeIndex(values)
+    if values.tz is not None:
+        return [ts.isoformat() for ts in values]
+    return values.to_numpy().astype("datetime64[s]").astype(str).tolist()
+
+
+def count_failed_buckets(df, ts_col="timestamp", status_col="status", freq="5T"):
+    """
+    Per-bucket total_count and failed_count (status != 'success'), indexed by
+    'bucket', in one grouped pass.
+    """
+    bucket = df[ts_col].dt.floor(freq).rename("bucket")
+    # summing the boolean mask directly yields int64 counts without an
+    # int64 copy of the mask; no filtered frame is built either
+    is_failed = df[status_col] != "success"
+    return is_failed.groupby(bucket).agg(total_count="size", failed_count="sum")
+
+
+@functools.lru_cache(maxsize=8)
+def _failed_buckets_cached(path, mtime_ns, size, ts_col, status_col, freq):
+    df = load_transactions(path, ts_col, columns=(status_col,))
+    return count_failed_buckets(df, ts_col, status_col, freq)
+
+
+def load_failed_buckets(csv_path="data/transactions.csv", ts_col="timestamp",
+                        status_col="status", freq="5T"):
+    st = os.stat(csv_path)
+    path = os.path.abspath(csv_path)
+
+    with _AGG_LOCK:
+        agg = _failed_buckets_cached(path, st.st_mtime_ns, st.st_size, ts_col, status_col, freq)
+    return agg.copy(deep=False)
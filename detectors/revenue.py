@@ -5,30 +5,34 @@ Assumes transactions.csv has an 'amount' column and 'status'. Buckets revenue by
 computes rolling baseline (median) and flags large drops: current_total < baseline * factor
 """
 
-import pandas as pd
+from detectors.loader import ROLLING_ENGINE, iso_seconds, load_transactions
+
+COLUMNS = ("timestamp", "status", "amount")
 
 def detect_revenue_drop(csv_path="data/transactions.csv", ts_col="timestamp", freq="1H",
-                        window=6, factor=0.7, min_revenue=1.0):
-    df = pd.read_csv(csv_path, parse_dates=[ts_col])
+                        window=6, factor=0.7, min_revenue=1.0, df=None):
+    if df is None:
+        df = load_transactions(csv_path, ts_col)
     if df.empty:
         print("No transactions found.")
         return []
 
-    df['bucket'] = df[ts_col].dt.floor(freq)
-    # only successful revenue contributes
-    revenue = df[df['status']=='success'].groupby('bucket')['amount'].sum().rename('revenue')
-    revenue = revenue.sort_index()
+    # only successful revenue contributes: filter first, then bucket just those rows
+    ok = df.loc[df['status']=='success', [ts_col, 'amount']]
+    bucket = ok[ts_col].dt.floor(freq).rename('bucket')
+    # groupby(sort=True) already returns the buckets in order; no sort_index pass
+    revenue = ok['amount'].groupby(bucket, sort=True).sum().rename('revenue')
     results = []
     # rolling baseline: median of previous `window` buckets
-    rolling_med = revenue.shift(1).rolling(window=window, min_periods=1).median().fillna(0)
-    for ts in revenue.index:
-        baseline = rolling_med.loc[ts]
-        cur = revenue.loc[ts]
-        if baseline <= 0:
-            continue
-        if cur < baseline * factor and cur >= min_revenue:
-            print(f"Revenue drop at {ts} current={cur:.2f} baseline={baseline:.2f}")
-            results.append({"timestamp": ts.isoformat(), "current_revenue": float(cur), "baseline": float(baseline)})
+    rolling_med = revenue.shift(1).rolling(window=window, min_periods=1).median(**ROLLING_ENGINE).fillna(0)
+    # flag drops on aligned arrays instead of two .loc lookups per bucket
+    cur_arr = revenue.to_numpy()
+    base_arr = rolling_med.to_numpy()
+    hits = (base_arr > 0) & (cur_arr < base_arr * factor) & (cur_arr >= min_revenue)
+    drops = revenue.index[hits]
+    for ts, iso, cur, baseline in zip(drops, iso_seconds(drops), cur_arr[hits], base_arr[hits]):
+        print(f"Revenue drop at {ts} current={cur:.2f} baseline={baseline:.2f}")
+        results.append({"timestamp": iso, "current_revenue": float(cur), "baseline": float(baseline)})
     if not results:
         print("No revenue drops found.")
     return results
@@ -3,12 +3,15 @@ import json
 from detectors.latency import detect_latency_spike
 from detectors.revenue import detect_revenue_drop
 from detectors.geo import detect_geo_failures
+from detectors.loader import load_transactions
 
-def run_all_extra():
+def run_all_extra(path="data/transactions.csv"):
+    # parse once and hand the same frame to every detector
+    df = load_transactions(path)
     res = {
-        "latency": detect_latency_spike(),
-        "revenue": detect_revenue_drop(),
-        "geo": detect_geo_failures()
+        "latency": detect_latency_spike(path, df=df),
+        "revenue": detect_revenue_drop(path, df=df),
+        "geo": detect_geo_failures(path, df=df)
     }
     print(json.dumps(res, indent=2))
 
@@ -6,6 +6,15 @@ import pandas as pd
 import numpy as np
 import math
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the pandas implementation is used instead
+    njit = None
+
+from detectors.loader import count_failed_buckets, iso_seconds, load_failed_buckets
+
+COLUMNS = ("timestamp", "status")
+
 # --- NEW HELPER ADDED ---
 def safe_num(x):
     """Return x if finite, else convert inf/-inf/nan to string."""
@@ -16,29 +25,78 @@ def safe_num(x):
     return x
 
 
-def detect_failed_tx_spike(csv_path, ts_col='timestamp', status_col='status',
-                           freq='5T', window=6, z_thresh=1, min_failed=5):
+def _rolling_zscore_kernel(x, window):
+    """
+    Mean, std (ddof=1) and z-score of each x[i] against the previous `window`
+    points, from a running sum and sum of squares in one pass. Mirrors the
+    pandas version in detect_failed_tx_spike: the first point has no
+    baseline (NaN), a one-point window's std counts as 1.0. Exact for integer
+    counts; pandas' streaming variance can differ in the last bit.
+    """
+    n = x.size
+    mean = np.empty(n)
+    std = np.empty(n)
+    z = np.empty(n)
+    s = 0.0
+    s2 = 0.0
+    for i in range(n):
+        k = min(i, window)
+        if k == 0:
+            m = np.nan
+            sd = 1.0
+        else:
+            m = s / k
+            sd = 1.0 if k == 1 else math.sqrt(max(k * s2 - s * s, 0.0) / (k * (k - 1.0)))
+        mean[i] = m
+        std[i] = sd
+        z[i] = (x[i] - m) / sd
+        # slide the window: x[i] comes in, x[i - window] drops out
+        s += x[i]
+        s2 += x[i] * x[i]
+        if i >= window:
+            s -= x[i - window]
+            s2 -= x[i - window] * x[i - window]
+    return mean, std, z
+
+# error_model="numpy": a zero std gives inf/nan like pandas instead of raising
+rolling_zscore = (njit(cache=True, error_model="numpy")(_rolling_zscore_kernel)
+                  if njit is not None else None)
+
+
+def failed_zscores(counts, window):
+    """
+    (rolling mean, rolling std, z-score) arrays for a series of per-bucket
+    failed counts, each point scored against the previous `window` points.
+    Uses the compiled kernel when numba is installed, pandas otherwise.
+    """
+    x = np.asarray(counts, dtype=np.float64)
+    if rolling_zscore is not None:
+        return rolling_zscore(x, window)
+
+    # Rolling mean and std for seasonal baseline (one shifted window for both)
+    s = pd.Series(x)
+    prior = s.shift(1).rolling(window=window, min_periods=1)
+    mean = prior.mean()
+    std = prior.std().fillna(1)
+    return mean.to_numpy(), std.to_numpy(), ((s - mean) / std).to_numpy()
 
-    df = pd.read_csv(csv_path, parse_dates=[ts_col])
-    if df.empty:
+
+def detect_failed_tx_spike(csv_path, ts_col='timestamp', status_col='status',
+                           freq='5T', window=6, z_thresh=1, min_failed=5, df=None):
+
+    # Count failed and total events in each fixed time bucket (cached per
+    # file version; computed directly when a frame is passed in)
+    if df is None:
+        agg = load_failed_buckets(csv_path, ts_col, status_col, freq)
+    else:
+        agg = count_failed_buckets(df, ts_col, status_col, freq)
+    if agg.empty:
         print("No transactions found.")
         return []
 
-    # Bucket events into fixed time intervals
-    df['bucket'] = df[ts_col].dt.floor(freq)
-
-    # Count failed and total events in each bucket
-    failed = df[df[status_col] != 'success'].groupby('bucket').size().rename('failed_count')
-    total = df.groupby('bucket').size().rename('total_count')
-    agg = pd.concat([total, failed], axis=1).fillna(0)
-    agg['failed_count'] = agg['failed_count'].astype(int)
-
-    # Rolling mean and std for seasonal baseline
-    agg['rolling_mean'] = agg['failed_count'].shift(1).rolling(window=window, min_periods=1).mean()
-    agg['rolling_std'] = agg['failed_count'].shift(1).rolling(window=window, min_periods=1).std().fillna(1)
-
-    # Z-score calculation
-    agg['zscore'] = (agg['failed_count'] - agg['rolling_mean']) / agg['rolling_std']
+    # Rolling baseline and z-score of each bucket against the previous `window`
+    agg['rolling_mean'], agg['rolling_std'], agg['zscore'] = failed_zscores(
+        agg['failed_count'].to_numpy(), window)
 
     # Filter anomalies
     anomalies = agg[(agg['zscore'] > z_thresh) & (agg['failed_count'] >= min_failed)]
@@ -47,20 +105,17 @@ def detect_failed_tx_spike(csv_path, ts_col='timestamp', status_col='status',
         print("No anomalies found.")
         return []
 
+    failed = anomalies['failed_count'].to_numpy()
+    zs = anomalies['zscore'].to_numpy()
+    # same as safe_num, for the whole column: inf/-inf/nan become strings so
+    # JSON never contains them, finite values stay Python floats
+    z_vals = np.where(np.isfinite(zs), zs.astype(object), zs.astype(str))
+
     results = []
     print("\nAnomalies detected:")
-    for idx, row in anomalies.iterrows():
-
-        # Apply safe_num so JSON never contains inf or -inf
-        z_val = safe_num(float(row['zscore']))
-
-        print(f" - {idx} failed={row['failed_count']} z={z_val}")
-
-        results.append({
-            "timestamp": idx.isoformat(),
-            "failed": int(row['failed_count']),
-            "zscore": z_val   # <-- SAFE VALUE (never raw inf)
-        })
+    for idx, iso, n, z_val in zip(anomalies.index, iso_seconds(anomalies.index), failed, z_vals):
+        print(f" - {idx} failed={n} z={z_val}")
+        results.append({"timestamp": iso, "failed": int(n), "zscore": z_val})
 
     return results
 
@@ -11,8 +11,11 @@ if not failed.empty:
 else:
     print("No failed rows found.")
 print("\n-- Top buckets by failed count --")
-# bucket by 5-min (string slice is fine)
-buckets = df.copy()
-buckets['bucket'] = buckets['timestamp'].astype(str).str.slice(0,16)  # up to minutes
-counts = buckets.groupby('bucket')['status'].apply(lambda s: (s!="success").sum()).sort_values(ascending=False)
+# bucket by minute: floor the datetimes and format only the bucket labels
+# (same text as slicing every timestamp string to 16 chars)
+bucket = df['timestamp'].dt.floor('min').rename('bucket')
+# count failures with one grouped sum over a boolean mask, not a lambda per bucket
+counts = (df['status'] != "success").groupby(bucket).sum()
+counts.index = counts.index.strftime('%Y-%m-%d %H:%M')
+counts = counts.sort_values(ascending=False)
 print(counts.head(20).to_string())
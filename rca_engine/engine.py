@@ -3,19 +3,28 @@
 Minimal RCA engine for AOHI.
 
 This simple implementation:
-- calls the detectors via the existing API helper (we import detectors directly),
-  or it can be called with precomputed detector outputs.
+- calls the detector modules directly, or it can be called with precomputed
+  detector outputs.
 - applies a tiny rule set:
     - if geo detector reports many failures in same country => RCA: "regional outage"
     - if revenue drop & failed transactions spike at similar time => RCA: "payment gateway / revenue issue"
 - returns a list of RCA items with explanation and suggested playbook actions.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 import importlib
+import inspect
 import traceback
 import math
 
+# How a discovered detector gets called, decided once at discovery time.
+CALL_NOARG = "noarg"   # every parameter has a default
+CALL_CSV = "csv"       # needs a path, module exposes CSV_PATH
+CALL_SKIP = "skip"     # needs arguments we can't supply
+
+# (module name, module, first detect_* function, call strategy), filled on first use.
+_DETECTOR_CACHE: List[Tuple[str, Any, Any, str]] = []
+
 def _safe_float(v):
     try:
         if v is None:
@@ -27,42 +36,61 @@ def _safe_float(v):
     except Exception:
         return None
 
+def _call_strategy(mod, func) -> str:
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return CALL_NOARG
+    required = [
+        p for p in params
+        if p.default is p.empty and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+    ]
+    if not required:
+        return CALL_NOARG
+    if getattr(mod, "CSV_PATH", None):
+        return CALL_CSV
+    return CALL_SKIP
+
+def _discover_detectors() -> List[Tuple[str, Any, Any, str]]:
+    """
+    Walk the detectors package once and remember the detect_* function of each
+    module together with how to call it, so analyze() does no reflection.
+    """
+    if not _DETECTOR_CACHE:
+        import pkgutil, detectors
+        found = []
+        for finder, name, ispkg in pkgutil.iter_modules(detectors.__path__):
+            mod = importlib.import_module(f"detectors.{name}")
+            # pick first detect function
+            func = None
+            for attr in dir(mod):
+                if attr.startswith("detect_") and callable(getattr(mod, attr)):
+                    func = getattr(mod, attr)
+                    break
+            if func:
+                found.append((f"detectors.{name}", mod, func, _call_strategy(mod, func)))
+        _DETECTOR_CACHE.extend(found)
+    return _DETECTOR_CACHE
+
 def analyze(detectors_output: List[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
-    If detectors_output is None, import detectors.run_all or call them directly.
+    If detectors_output is None, the detector modules are called directly.
     Expected detectors_output is a list of dicts like:
     [{"detector": "detectors.ewma.detect_ewma_failed", "result": [...]}, ...]
     Returns a dict with structured RCA results.
     """
     try:
         if detectors_output is None:
-            # try to import an existing module that returns detectors output
-            try:
-                import api.fastapi_app as fa
-                detectors_output = fa.run_detectors(force=False).get("detectors", [])
-            except Exception:
-                # fallback: try to load detectors modules individually
-                detectors_output = []
-                import pkgutil, detectors
-                for finder, name, ispkg in pkgutil.iter_modules(detectors.__path__):
-                    mod = importlib.import_module(f"detectors.{name}")
-                    # pick first detect function
-                    func = None
-                    for attr in dir(mod):
-                        if attr.startswith("detect_") and callable(getattr(mod, attr)):
-                            func = getattr(mod, attr)
-                            break
-                    if func:
-                        try:
-                            res = func()
-                        except TypeError:
-                            # try with default csv path attr
-                            csv_path = getattr(mod, "CSV_PATH", None)
-                            if csv_path:
-                                res = func(csv_path)
-                            else:
-                                res = []
-                        detectors_output.append({"detector": f"detectors.{name}", "result": res})
+            # call the (cached) detectors modules individually
+            detectors_output = []
+            for mod_name, mod, func, strategy in _discover_detectors():
+                if strategy == CALL_NOARG:
+                    res = func()
+                elif strategy == CALL_CSV:
+                    res = func(mod.CSV_PATH)
+                else:
+                    res = []
+                detectors_output.append({"detector": mod_name, "result": res})
 
         # now analyze detectors_output
         rc_results = []
@@ -99,18 +127,24 @@ def analyze(detectors_output: List[Dict[str, Any]] = None) -> Dict[str, Any]:
 
         # Rule 2: revenue drop together with failed tx spike -> payment issue
         if revenue_drops and failed_spikes:
-            # crude time match: check any revenue drop timestamp close to failed spike timestamp
+            # crude time match: same (naive) hour. Index the spikes by hour once
+            # instead of comparing every revenue drop with every spike.
+            spikes_by_hour = {}
+            for f in failed_spikes:
+                fts = f.get("timestamp")
+                if fts:
+                    spikes_by_hour.setdefault(str(fts)[:13], []).append(f)
             for r in revenue_drops:
                 rts = r.get("timestamp")
-                for f in failed_spikes:
-                    fts = f.get("timestamp")
-                    if rts and fts and str(rts)[:13] == str(fts)[:13]:  # same hour naive
-                        rc_results.append({
-                            "root_cause": "Revenue drop correlated with failed transactions",
-                            "confidence": 0.85,
-                            "evidence": {"revenue": r, "failed": f},
-                            "recommendation": "Check payment gateway, merchant keys, and recent deploys affecting payments.",
-                        })
+                if not rts:
+                    continue
+                for f in spikes_by_hour.get(str(rts)[:13], ()):
+                    rc_results.append({
+                        "root_cause": "Revenue drop correlated with failed transactions",
+                        "confidence": 0.85,
+                        "evidence": {"revenue": r, "failed": f},
+                        "recommendation": "Check payment gateway, merchant keys, and recent deploys affecting payments.",
+                    })
 
         # If no rc_results found, provide a fallback summary
         if not rc_results:
@@ -3,45 +3,107 @@
 Simple consumer:
  - watches stream/transactions folder
  - moves each JSON event to an 'ingested' CSV file (append)
- - after each batch of N events, runs the seasonal zscore detector on the ingested CSV
+ - after each batch of N events, runs the seasonal zscore check incrementally:
+   per-bucket counts are kept in memory (seeded once from the ingested CSV)
+   and only buckets whose baseline the batch can change are re-scored
 """
 import argparse
+import bisect
 import json
 import os
 import time
 import csv
 from pathlib import Path
-from detectors.seasonal_zscore import detect_failed_tx_spike
+
+import pandas as pd
+
+from detectors.loader import load_failed_buckets
+from detectors.seasonal_zscore import failed_zscores, safe_num
+
+# detect_failed_tx_spike's defaults
+FREQ = "5T"
+WINDOW = 6
+Z_THRESH = 1
+MIN_FAILED = 5
 
 def ensure_dir(p): Path(p).mkdir(parents=True, exist_ok=True)
 
+def load_counts(ingested_csv, freq=FREQ):
+    """{bucket: [failed, total]} for everything already in the ingested CSV."""
+    if not Path(ingested_csv).exists():
+        return {}
+    agg = load_failed_buckets(ingested_csv, freq=freq)
+    return {b: [int(f), int(t)] for b, f, t in
+            zip(agg.index, agg['failed_count'].to_numpy(), agg['total_count'].to_numpy())}
+
+def update_counts(counts, events, freq=FREQ):
+    """Add a batch of events to counts; returns the buckets it touched."""
+    buckets = pd.to_datetime([e.get("timestamp") for e in events], errors="coerce").floor(freq)
+    touched = set()
+    for bucket, event in zip(buckets, events):
+        if pd.isna(bucket):
+            continue
+        c = counts.setdefault(bucket, [0, 0])
+        c[0] += event.get("status") != "success"
+        c[1] += 1
+        touched.add(bucket)
+    return touched
+
+def new_anomalies(counts, touched, reported, window=WINDOW, z_thresh=Z_THRESH,
+                  min_failed=MIN_FAILED):
+    """
+    Score the buckets from the earliest touched one onwards (each needs the
+    `window` buckets before it as history) and return the anomalies not
+    reported yet, in detect_failed_tx_spike's format.
+    """
+    buckets = sorted(counts)
+    first = bisect.bisect_left(buckets, min(touched))
+    start = max(0, first - window)
+    failed = [counts[b][0] for b in buckets[start:]]
+    _, _, z = failed_zscores(failed, window)
+
+    found = []
+    for bucket, n, zz in zip(buckets[first:], failed[first - start:], z[first - start:]):
+        if zz > z_thresh and n >= min_failed and bucket not in reported:
+            reported.add(bucket)
+            found.append({"timestamp": bucket.isoformat(), "failed": n,
+                          "zscore": safe_num(float(zz))})
+    return found
+
+def read_events(paths):
+    events = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as rf:
+            events.append(json.load(rf))
+    return events
+
 def consume(stream_dir, ingested_csv, poll=1.0, batch=10):
     ensure_dir(stream_dir)
     ensure_dir(os.path.dirname(ingested_csv) or ".")
-    # create CSV file with header if not exists
-    header_written = Path(ingested_csv).exists()
+    counts = load_counts(ingested_csv)
+    reported = set()
     while True:
         files = sorted([f for f in os.listdir(stream_dir) if f.endswith(".json")])
         if not files:
             time.sleep(poll)
             continue
-        count = 0
-        for fname in files[:batch]:
-            path = os.path.join(stream_dir, fname)
-            with open(path, 'r', encoding='utf-8') as rf:
-                obj = json.load(rf)
-            # append to CSV
-            write_header = not Path(ingested_csv).exists()
-            with open(ingested_csv, 'a', newline='', encoding='utf-8') as wf:
-                writer = csv.DictWriter(wf, fieldnames=list(obj.keys()))
-                if write_header:
-                    writer.writeheader()
-                writer.writerow(obj)
+        paths = [os.path.join(stream_dir, fname) for fname in files[:batch]]
+        events = read_events(paths)
+        # append the whole batch through one file handle and writer; the
+        # header is written only when the CSV is created
+        write_header = not Path(ingested_csv).exists()
+        with open(ingested_csv, 'a', newline='', encoding='utf-8') as wf:
+            writer = csv.DictWriter(wf, fieldnames=list(events[0].keys()))
+            if write_header:
+                writer.writeheader()
+            writer.writerows(events)
+        # delete the events only once their rows are in the CSV
+        for path in paths:
             os.remove(path)
-            count += 1
-        if count > 0:
-            print(f"Ingested {count} events. Running detector...")
-            detect_failed_tx_spike(ingested_csv)
+        touched = update_counts(counts, events)
+        print(f"Ingested {len(events)} events. Checking {len(touched)} bucket(s)...")
+        for a in new_anomalies(counts, touched, reported) if touched else []:
+            print(f" - {a['timestamp']} failed={a['failed']} z={a['zscore']}")
         time.sleep(poll)
 
 if __name__ == "__main__":
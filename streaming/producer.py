@@ -23,6 +23,9 @@ DATA_PATH = ROOT / "data" / "transactions.csv"
 RUNTIME_DIR = ROOT / "runtime"
 STREAM_FILE = RUNTIME_DIR / "stream_events.csv"
 
+# readers see writes right away; fsync is only for durability, so batch it
+FSYNC_EVERY = 50
+
 
 def find_timestamp_column(df: pd.DataFrame) -> Optional[str]:
     for col in ["timestamp", "event_time", "ts", "time"]:
@@ -48,7 +51,7 @@ def main() -> None:
         )
 
     # sort by time so stream is chronological
-    df[ts_col] = pd.to_datetime(df[ts_col], errors="coerce")
+    df[ts_col] = pd.to_datetime(df[ts_col], format="ISO8601", errors="coerce")
     df = df.sort_values(ts_col)
 
     # optional: limit to first N rows so demo is not too long
@@ -63,22 +66,31 @@ def main() -> None:
         STREAM_FILE.rename(backup)
 
     print(f"[producer] Writing events gradually into {STREAM_FILE}")
-    header_written = False
     total_rows = len(df)
 
-    with open(STREAM_FILE, "w", encoding="utf-8") as f:
-        for idx, (_, row) in enumerate(df.iterrows(), start=1):
-            # write header only once
-            if not header_written:
-                f.write(",".join(df.columns) + "\n")
-                header_written = True
+    # serialize every row once up front; the loop only writes ready-made bytes
+    text = df.to_csv(index=False, lineterminator="\n")
+    header, *rows = text.encode("utf-8").splitlines(keepends=True)
 
-            line = ",".join(str(row[col]) for col in df.columns)
-            f.write(line + "\n")
-            f.flush()
+    # unbuffered append: each os.write is visible to the consumer immediately
+    fd = os.open(STREAM_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, header)
+        deadline = time.monotonic()
+        for idx, line in enumerate(rows, start=1):
+            os.write(fd, line)
+            if idx % FSYNC_EVERY == 0:
+                os.fsync(fd)
 
             print(f"[producer] Sent event {idx}/{total_rows}")
-            time.sleep(0.5)  # simulate 1 event per 0.5 sec
+            # simulate 1 event per 0.5 sec: sleep until the next absolute
+            # deadline, so write/print time and sleep overshoot don't add up
+            deadline += 0.5
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+    finally:
+        os.close(fd)
 
     print("[producer] Finished sending all events.")
 
@@ -36,33 +36,46 @@ def main() -> None:
             "Expected one of: timestamp, event_time, ts"
         )
 
-    df[ts_col] = pd.to_datetime(df[ts_col], errors="coerce")
+    df[ts_col] = pd.to_datetime(df[ts_col], format="ISO8601", errors="coerce")
+
+    rng = np.random.default_rng()
 
     # -------------------------
     # 1) Add base latency pattern
     # -------------------------
-    # Normal latency ~ 80–250 ms
-    base_latency = np.random.normal(loc=150, scale=40, size=len(df)).clip(40, 400)
+    # Normal latency ~ 80–250 ms, drawn and clipped in one preallocated buffer
+    # (float32 is plenty: the values are truncated to whole ms below)
+    base_latency = np.empty(len(df), dtype=np.float32)
+    rng.standard_normal(dtype=np.float32, out=base_latency)
+    base_latency *= 40
+    base_latency += 150
+    np.clip(base_latency, 40, 400, out=base_latency)
 
     # Convert to int
-    df["latency_ms"] = base_latency.astype(int)
+    df["latency_ms"] = base_latency.astype(np.int32)
 
     # -------------------------
     # 2) Inject specific latency anomaly to match your existing anomalies
     #    around 2025-12-05 03:00 in country IN
     # -------------------------
     if "country" in df.columns:
-        mask_anomaly = (
-            (df[ts_col] >= "2025-12-05 03:00:00")
-            & (df[ts_col] <= "2025-12-05 03:10:00")
-            & (df["country"] == "IN")
-        )
-
-        n_anomaly_rows = mask_anomaly.sum()
+        # binary-search the window on the time-sorted timestamps instead of
+        # comparing every row; only rows inside it are checked for country
+        ts = df[ts_col].to_numpy()
+        order = None if df[ts_col].is_monotonic_increasing else np.argsort(ts, kind="stable")
+        ts_sorted = ts if order is None else ts[order]
+        lo = np.searchsorted(ts_sorted, np.datetime64("2025-12-05T03:00:00"), side="left")
+        hi = np.searchsorted(ts_sorted, np.datetime64("2025-12-05T03:10:00"), side="right")
+        window = np.arange(lo, hi) if order is None else order[lo:hi]
+        anomaly_rows = window[df["country"].to_numpy()[window] == "IN"]
+
+        n_anomaly_rows = len(anomaly_rows)
         if n_anomaly_rows > 0:
             print(f"Injecting high latency for {n_anomaly_rows} rows in IN between 03:00–03:10")
             # Very high latency for anomaly rows
-            df.loc[mask_anomaly, "latency_ms"] = np.random.randint(1500, 3000, size=n_anomaly_rows)
+            df.iloc[anomaly_rows, df.columns.get_loc("latency_ms")] = rng.integers(
+                1500, 3000, size=n_anomaly_rows, dtype=np.int32
+            )
         else:
             print("No rows matched anomaly mask (country IN, 03:00–03:10). Skipping explicit spike.")
     else:
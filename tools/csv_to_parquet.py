@@ -0,0 +1,60 @@
+"""
+Utility script to write data/transactions.parquet next to transactions.csv
+
+Run from project root:
+    python tools/csv_to_parquet.py [csv_path]
+
+The detectors' loader reads the Parquet copy instead of the CSV whenever it
+is at least as new as the CSV: only the columns a detector needs are read,
+and status/country are dictionary encoded on disk. Re-run this after
+regenerating the CSV (an older Parquet file is ignored, not used).
+"""
+
+import os
+import sys
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pacsv = pq = None
+
+TRANSACTIONS_PATH = os.path.join("data", "transactions.csv")
+ROW_GROUP_SIZE = 200_000
+
+
+def main() -> None:
+    if pq is None:
+        raise SystemExit("pyarrow is required: pip install pyarrow")
+
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else TRANSACTIONS_PATH
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"Could not find {csv_path}.")
+    out_path = os.path.splitext(csv_path)[0] + ".parquet"
+
+    print(f"Loading {csv_path} ...")
+    table = pacsv.read_csv(
+        csv_path,
+        convert_options=pacsv.ConvertOptions(
+            column_types={"timestamp": pa.timestamp("ns"), "amount": pa.float64()},
+        ),
+    )
+
+    # write to a temp name first so the loader never sees a half-written file
+    tmp_path = out_path + ".tmp"
+    pq.write_table(
+        table,
+        tmp_path,
+        compression="zstd",
+        use_dictionary=True,
+        row_group_size=ROW_GROUP_SIZE,
+    )
+    os.replace(tmp_path, out_path)
+
+    print(f"Wrote {table.num_rows} rows to {out_path} "
+          f"({os.path.getsize(out_path)} bytes, CSV was {os.path.getsize(csv_path)})")
+
+
+if __name__ == "__main__":
+    main()
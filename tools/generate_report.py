@@ -7,11 +7,21 @@ Run: python generate_report_pro.py --name "Navaneeth Kaku"
 import os
 import json
 import argparse
+import hashlib
+import io
+import shutil
 import traceback
+from xml.sax.saxutils import escape
+
+import orjson
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# finished PDFs, keyed by what went into them (see report_cache_key)
+CACHE_DIR = os.path.join(DATA_DIR, ".cache")
+CACHE_SIZE = 100
+
 def try_import_run_rca():
     try:
         from rca_engine.engine import run_rca
@@ -19,35 +29,59 @@ def try_import_run_rca():
     except Exception as e:
         return None
 
+RCA_JSON_FILES = ("rca.json", "incidents_full.json", "incidents.json")
+
+def read_json(path):
+    try:
+        with open(path, "r", encoding="utf8") as fh:
+            return json.load(fh)
+    except Exception:
+        return None
+
 def load_rca_data():
-    # 1) try run_rca if available
+    tx = os.path.join(DATA_DIR, "transactions.csv")
+    sys_metrics = os.path.join(DATA_DIR, "system_metrics.csv")
+    crm = os.path.join(DATA_DIR, "crm_events.csv")
+
+    # 1) a saved JSON at least as new as every RCA input: use it without
+    #    importing rca_engine (and pandas) or re-running the analysis
+    newest_input = max(
+        (os.path.getmtime(p) for p in (tx, sys_metrics, crm) if os.path.exists(p)), default=0
+    )
+    for fname in RCA_JSON_FILES:
+        p = os.path.join(DATA_DIR, fname)
+        if os.path.exists(p) and os.path.getmtime(p) >= newest_input:
+            data = read_json(p)
+            if data is not None:
+                return data
+
+    # 2) try run_rca if available
     run_rca = try_import_run_rca()
     if run_rca:
         try:
-            tx = os.path.join(os.path.dirname(__file__), "data", "transactions.csv")
-            sys_metrics = os.path.join(os.path.dirname(__file__), "data", "system_metrics.csv")
-            crm = os.path.join(os.path.dirname(__file__), "data", "crm_events.csv")
             r = run_rca(tx, sys_metrics, crm)
             if isinstance(r, dict):
                 return r
         except Exception:
             print("run_rca failed:", traceback.format_exc())
 
-    # 2) fallback: try common files
-    for fname in ("rca.json", "incidents_full.json", "incidents.json"):
+    # 3) fallback: try common files, even if older than the inputs
+    for fname in RCA_JSON_FILES:
         p = os.path.join(DATA_DIR, fname)
         if os.path.exists(p):
-            try:
-                with open(p, "r", encoding="utf8") as fh:
-                    return json.load(fh)
-            except Exception:
-                pass
+            data = read_json(p)
+            if data is not None:
+                return data
 
-    # 3) last resort: build minimal empty structure
+    # 4) last resort: build minimal empty structure
     return {"incidents": []}
 
 # PDF generation (reportlab)
 def generate_logo(path, title="AOHI"):
+    # the logo only changes with this script (main always passes the same
+    # title): reuse it if it is newer than the script, without loading Pillow
+    if os.path.exists(path) and os.path.getmtime(path) > os.path.getmtime(__file__):
+        return True
     try:
         from PIL import Image, ImageDraw, ImageFont
     except Exception as e:
@@ -59,76 +93,151 @@ def generate_logo(path, title="AOHI"):
         font = ImageFont.truetype("arial.ttf", 36)
     except Exception:
         font = ImageFont.load_default()
-    w,h = draw.textsize(title, font=font)
+    left, top, right, bottom = font.getbbox(title)
+    w, h = right - left, bottom - top
     draw.text(((400-w)/2, (80-h)/2), title, fill=(255,255,255,255), font=font)
     img.save(path)
     return True
 
-def build_pdf(output_path, incidents_obj, logo_path=None, author_name=None):
+def render_pdf(incidents_obj, logo_path=None, author_name=None):
+    """Lay out the report in memory and return the PDF bytes."""
     try:
+        from reportlab.lib import colors
         from reportlab.lib.pagesizes import letter
-        from reportlab.pdfgen import canvas
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.lib.units import inch
+        from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
     except Exception as e:
         raise RuntimeError("reportlab is required: pip install reportlab") from e
 
-    c = canvas.Canvas(output_path, pagesize=letter)
     width, height = letter
-    # header
-    if logo_path and os.path.exists(logo_path):
-        try:
-            c.drawImage(logo_path, inch*0.5, height-inch*1.25, width=inch*1.5, preserveAspectRatio=True, mask='auto')
-        except Exception:
-            pass
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(inch*2.1, height-inch*0.75, "AOHI — Adaptive Operational Health Intelligence")
-    c.setFont("Helvetica", 9)
     import datetime
-    c.drawString(inch*0.5, height-inch*1.5, f"Generated: {datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}")
-    if author_name:
-        c.drawString(inch*0.5, height-inch*1.65, f"Prepared by: {author_name}")
+    generated = f"Generated: {datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}"
+
+    def draw_header(c, doc):
+        # header
+        if logo_path and os.path.exists(logo_path):
+            try:
+                c.drawImage(logo_path, inch*0.5, height-inch*1.25, width=inch*1.5, preserveAspectRatio=True, mask='auto')
+            except Exception:
+                pass
+        c.setFont("Helvetica-Bold", 16)
+        c.drawString(inch*2.1, height-inch*0.75, "AOHI — Adaptive Operational Health Intelligence")
+        c.setFont("Helvetica", 9)
+        c.drawString(inch*0.5, height-inch*1.5, generated)
+        if author_name:
+            c.drawString(inch*0.5, height-inch*1.65, f"Prepared by: {author_name}")
+
+    styles = getSampleStyleSheet()
+    cell = ParagraphStyle("Cell", parent=styles["Normal"], fontSize=8, leading=10)
 
     incidents = incidents_obj.get("incidents", []) if isinstance(incidents_obj, dict) else incidents_obj
     total_incidents = len(incidents)
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(inch*0.5, height-inch*2.0, "Summary")
-    c.setFont("Helvetica", 10)
-    y = height - inch*2.2
-    c.drawString(inch*0.5, y, f"Total incidents detected: {total_incidents}")
-    y -= inch*0.25
-    c.setFont("Helvetica", 9)
+
+    # one row per incident; Paragraph cells wrap long text inside the column
+    data = [["#", "Incident", "Detected by", "Root causes", "Suggested playbooks"]]
     for i, inc in enumerate(incidents):
-        if y < inch*1.5:
-            c.showPage()
-            y = height - inch*0.5
-            c.setFont("Helvetica", 9)
         bucket = inc.get("incident_bucket", "(unknown)")
         detected = ", ".join(inc.get("detected_by", [])) if inc.get("detected_by") else ""
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(inch*0.5, y, f"{i+1}. Incident: {bucket}")
-        y -= inch*0.15
-        c.setFont("Helvetica", 9)
-        c.drawString(inch*0.6, y, f"Detected by: {detected}")
-        y -= inch*0.16
+        causes = []
         for rc in inc.get("root_causes", []):
-            rc_name = rc.get("root_cause", "")
-            desc = rc.get("description", "")
-            c.drawString(inch*0.6, y, f"- {rc_name}: {desc}")
-            y -= inch*0.14
+            causes.append(f"- {rc.get('root_cause', '')}: {rc.get('description', '')}")
             evidence = rc.get("evidence")
             if evidence:
-                ev_text = json.dumps(evidence, ensure_ascii=False)
-                c.drawString(inch*0.7, y, f"  Evidence: {ev_text}")
-                y -= inch*0.14
-        for p in inc.get("playbooks", []):
-            owner = p.get("owner", "")
-            priority = p.get("priority", "")
-            steps = p.get("steps", "")
-            c.drawString(inch*0.6, y, f"Suggested playbooks: {owner} | {priority} : {steps}")
-            y -= inch*0.16
-        y -= inch*0.06
-    c.showPage()
-    c.save()
+                ev_text = orjson.dumps(evidence, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+                causes.append(f"  Evidence: {ev_text.decode()}")
+        playbooks = [
+            f"{p.get('owner', '')} | {p.get('priority', '')} : {p.get('steps', '')}"
+            for p in inc.get("playbooks", [])
+        ]
+        data.append([
+            str(i + 1),
+            Paragraph(escape(str(bucket)), cell),
+            Paragraph(escape(detected), cell),
+            Paragraph("<br/>".join(escape(line) for line in causes), cell),
+            Paragraph("<br/>".join(escape(line) for line in playbooks), cell),
+        ])
+
+    table = Table(data, colWidths=[inch*0.3, inch*1.3, inch*1.2, inch*2.9, inch*1.8], repeatRows=1)
+    table.setStyle(TableStyle([
+        ("FONT", (0, 0), (-1, 0), "Helvetica-Bold", 9),
+        ("FONT", (0, 1), (0, -1), "Helvetica", 8),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ]))
+
+    # the page header is drawn on the first page; the story starts below it
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=letter, leftMargin=inch*0.5, rightMargin=inch*0.5,
+                            topMargin=inch*0.5, bottomMargin=inch*0.75)
+    story = [
+        Spacer(1, inch*1.3),
+        Paragraph("Summary", styles["Heading3"]),
+        Paragraph(f"Total incidents detected: {total_incidents}", styles["Normal"]),
+        Spacer(1, inch*0.15),
+    ]
+    if incidents:
+        story.append(table)
+    doc.build(story, onFirstPage=draw_header)
+    return buf.getvalue()
+
+def write_bytes(path, data):
+    with open(path, "wb") as fh:
+        fh.write(data)
+
+def report_cache_key(incidents_obj, logo_path=None, author_name=None):
+    """
+    Hash of everything the PDF is built from: the incidents (canonical JSON),
+    the author and the logo's bytes. None if the incidents aren't JSON-able.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        h.update(orjson.dumps(
+            [incidents_obj, author_name],
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        ))
+    except TypeError:
+        return None
+    if logo_path and os.path.exists(logo_path):
+        with open(logo_path, "rb") as fh:
+            h.update(fh.read())
+    return h.hexdigest()
+
+def prune_cache(keep=CACHE_SIZE):
+    """Keep only the `keep` most recently used cached PDFs."""
+    with os.scandir(CACHE_DIR) as it:
+        cached = sorted(
+            ((e.stat().st_mtime, e.path) for e in it if e.name.endswith(".pdf")),
+            reverse=True,
+        )
+    for _, old in cached[keep:]:
+        try:
+            os.unlink(old)
+        except OSError:
+            pass
+
+def build_pdf(output_path, incidents_obj, logo_path=None, author_name=None):
+    """
+    render_pdf, unless the same incidents/author/logo were rendered before:
+    then the cached PDF is copied (its 'Generated' time is the first run's).
+    """
+    key = report_cache_key(incidents_obj, logo_path, author_name)
+    cached = os.path.join(CACHE_DIR, f"{key}.pdf") if key else None
+    if cached and os.path.exists(cached):
+        shutil.copyfile(cached, output_path)
+        os.utime(cached)  # most recently used survives pruning
+        return output_path
+
+    # the rendered bytes go to both files; the output isn't read back
+    data = render_pdf(incidents_obj, logo_path, author_name)
+    write_bytes(output_path, data)
+    if cached:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = cached + ".tmp"
+        write_bytes(tmp_path, data)
+        os.replace(tmp_path, cached)
+        prune_cache()
     return output_path
 
 def main():
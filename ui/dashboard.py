@@ -1,8 +1,11 @@
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
+import pyarrow as pa
+import pyarrow.compute as pc
 import streamlit as st
 import os
 
@@ -23,13 +26,41 @@ API_BASE = os.getenv("AOHI_API_BASE", "http://127.0.0.1:8000")
 # Helpers
 # ----------------------------
 
+@st.cache_resource
+def http_session() -> requests.Session:
+    """
+    One keep-alive session for all API calls. The script re-runs on every
+    interaction, so it lives in Streamlit's resource cache, not a global.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_json(path: str, params: Tuple[Tuple[str, Any], ...]) -> Dict[str, Any]:
+    """GET API_BASE + path, uncached."""
+    resp = http_session().get(f"{API_BASE}{path}", params=dict(params), timeout=30)
+    resp.raise_for_status()
+    return resp.json()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_json(path: str, params: Tuple[Tuple[str, Any], ...]) -> Dict[str, Any]:
+    """get_json, with responses reused for 30s per (path, params)."""
+    return get_json(path, params)
+
+
 def call_api(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Call AOHI API and return JSON. On error, return an error dict."""
     url = f"{API_BASE}{path}"
+    query = tuple(sorted((params or {}).items()))
+    # force_run asks for a live run, so it must not be served from the cache
+    fetch = get_json if ("force_run", "true") in query else fetch_json
     try:
-        resp = requests.get(url, params=params, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
+        # errors raise out of fetch_json, so they are never cached
+        return fetch(path, query)
     except Exception as e:
         return {"error": str(e), "url": url, "params": params}
 
@@ -40,16 +71,66 @@ def pretty_json_block(label: str, data: Any) -> None:
     st.code(json.dumps(data, indent=2, default=str), language="json")
 
 
-def flatten_incidents(incidents_json: Dict[str, Any]) -> pd.DataFrame:
+# Flat tables are built straight into Arrow (which st.dataframe/st.line_chart
+# take natively) with fixed column types, so nothing is inferred per value.
+INCIDENT_SCHEMA = pa.schema([
+    ("detector", pa.string()),
+    ("timestamp", pa.string()),  # parsed to timestamp[ns] below
+    # float, not int: from_pylist would silently truncate a fractional count
+    ("failed", pa.float64()),
+    ("failed_count", pa.float64()),
+    ("zscore", pa.float64()),
+    ("current_revenue", pa.float64()),
+    ("baseline", pa.float64()),
+    ("country", pa.string()),
+])
+
+RCA_SCHEMA = pa.schema([
+    ("root_cause", pa.string()),
+    ("confidence", pa.float64()),
+    ("recommendation", pa.string()),
+    ("evidence", pa.string()),
+])
+
+
+def to_float(value: Any) -> Optional[float]:
+    """zscore comes back as a float or, for inf/nan, as a string."""
+    return None if value is None else float(value)
+
+
+ISO_TIMESTAMP = r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d{1,9})?)?(Z|[+-]\d{2}:?\d{2})?$"
+UTC_OFFSET = r"(Z|[+-]\d{2}:?\d{2})$"
+
+
+def parse_timestamps(col: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    ISO-8601 strings -> timestamp[ns], with or without fractional seconds;
+    values with an offset are converted to (naive) UTC. Anything else is null.
+    """
+    null = pa.scalar(None, pa.string())
+    # Arrow's cast parses ISO-8601 but fails the whole array on a bad value
+    col = pc.if_else(pc.match_substring_regex(col, ISO_TIMESTAMP), col, null)
+    aware = pc.match_substring_regex(col, UTC_OFFSET)
+    try:
+        naive = pc.cast(pc.if_else(aware, null, col), pa.timestamp("ns"))
+        utc = pc.cast(pc.if_else(aware, col, null), pa.timestamp("ns", "UTC"))
+    except pa.ArrowInvalid:
+        # shaped like ISO but not a real date (e.g. month 13)
+        return pc.strptime(col, format="%Y-%m-%dT%H:%M:%S", unit="ns", error_is_null=True)
+    return pc.if_else(aware, utc.cast(pa.timestamp("ns")), naive)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def flatten_incidents(incidents_json: Dict[str, Any]) -> pa.Table:
     """
-    Turn incidents JSON into a flat DataFrame.
+    Turn incidents JSON into a flat Arrow table.
 
     Columns:
       - detector
-      - timestamp
+      - timestamp (timestamp[ns])
       - failed
       - failed_count
-      - zscore (forced to string so Arrow is happy)
+      - zscore (float64; inf/nan are kept as floats)
       - current_revenue
       - baseline
       - country
@@ -57,7 +138,7 @@ def flatten_incidents(incidents_json: Dict[str, Any]) -> pd.DataFrame:
     rows: List[Dict[str, Any]] = []
 
     if not incidents_json:
-        return pd.DataFrame()
+        return INCIDENT_SCHEMA.empty_table()
 
     for det in incidents_json.get("incidents", []):
         det_name = det.get("detector", "unknown_detector")
@@ -68,33 +149,24 @@ def flatten_incidents(incidents_json: Dict[str, Any]) -> pd.DataFrame:
                     "timestamp": item.get("timestamp"),
                     "failed": item.get("failed"),
                     "failed_count": item.get("failed_count"),
-                    "zscore": item.get("zscore"),
+                    "zscore": to_float(item.get("zscore")),
                     "current_revenue": item.get("current_revenue"),
                     "baseline": item.get("baseline"),
                     "country": item.get("country"),
                 }
             )
 
-    if not rows:
-        return pd.DataFrame()
+    table = pa.Table.from_pylist(rows, schema=INCIDENT_SCHEMA)
 
-    df = pd.DataFrame(rows)
+    # Parse timestamp for charts (unparseable values become null)
+    return table.set_column(1, "timestamp", parse_timestamps(table["timestamp"]))
 
-    # Parse timestamp for charts
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
 
-    # IMPORTANT: force zscore to string, so "inf" + floats don't break Arrow
-    if "zscore" in df.columns:
-        df["zscore"] = df["zscore"].astype(str)
-
-    return df
-
-
-def flatten_rca(rca_json: Dict[str, Any]) -> pd.DataFrame:
+@st.cache_data(ttl=60, show_spinner=False)
+def flatten_rca(rca_json: Dict[str, Any]) -> pa.Table:
     """Flatten RCA JSON to a table."""
     if not rca_json:
-        return pd.DataFrame()
+        return RCA_SCHEMA.empty_table()
 
     results = rca_json.get("results", {}).get("results", [])
     rows = []
@@ -108,10 +180,7 @@ def flatten_rca(rca_json: Dict[str, Any]) -> pd.DataFrame:
             }
         )
 
-    if not rows:
-        return pd.DataFrame()
-
-    return pd.DataFrame(rows)
+    return pa.Table.from_pylist(rows, schema=RCA_SCHEMA)
 
 
 # ----------------------------
@@ -166,7 +235,7 @@ incidents_data = st.session_state.get("incidents_data")
 if incidents_data:
     df_inc = flatten_incidents(incidents_data)
 
-    if not df_inc.empty:
+    if df_inc.num_rows:
         st.subheader("Incidents table (flattened)")
         st.dataframe(df_inc, width="stretch")
 
@@ -175,16 +244,17 @@ if incidents_data:
         # Failures chart
         with col_failures:
             st.subheader("Failures over time (all detectors)")
-            df_fail = df_inc.copy()
-            df_fail["failed_metric"] = df_fail["failed_count"].fillna(df_fail["failed"])
-            df_fail = df_fail.dropna(subset=["timestamp", "failed_metric"])
-            if not df_fail.empty:
-                df_fail_chart = (
-                    df_fail.groupby("timestamp")["failed_metric"]
-                    .sum()
-                    .reset_index()
-                    .sort_values("timestamp")
-                )
+            failed_metric = pc.coalesce(df_inc["failed_count"], df_inc["failed"])
+            df_fail = pa.table(
+                {"timestamp": df_inc["timestamp"], "failed_metric": failed_metric}
+            ).drop_null()
+            if df_fail.num_rows:
+                # one sort, then sum each run of equal timestamps (no hash groupby)
+                ts = df_fail["timestamp"].to_numpy()
+                order = np.argsort(ts, kind="stable")
+                uniq, starts = np.unique(ts[order], return_index=True)
+                sums = np.add.reduceat(df_fail["failed_metric"].to_numpy()[order], starts)
+                df_fail_chart = {"timestamp": uniq, "failed_metric": sums}
                 st.line_chart(
                     df_fail_chart,
                     x="timestamp",
@@ -197,13 +267,12 @@ if incidents_data:
         # Revenue chart
         with col_revenue:
             st.subheader("Revenue anomalies")
-            df_rev = df_inc.dropna(subset=["current_revenue", "baseline"])
-            if not df_rev.empty:
-                df_rev_chart = (
-                    df_rev[["timestamp", "current_revenue", "baseline"]]
-                    .dropna()
-                    .sort_values("timestamp")
-                )
+            df_rev = df_inc.select(["timestamp", "current_revenue", "baseline"])
+            has_revenue = pc.and_(pc.is_valid(df_rev["current_revenue"]),
+                                  pc.is_valid(df_rev["baseline"]))
+            df_rev = df_rev.filter(has_revenue)
+            if df_rev.num_rows:
+                df_rev_chart = df_rev.drop_null().sort_by("timestamp")
                 st.line_chart(
                     df_rev_chart,
                     x="timestamp",
@@ -239,18 +308,23 @@ with col_rca_raw:
 rca_data = st.session_state.get("rca_data")
 if rca_data:
     df_rca = flatten_rca(rca_data)
-    if not df_rca.empty:
+    if df_rca.num_rows:
         st.subheader("RCA Summary (table)")
         st.dataframe(df_rca, width="stretch")
 
         st.subheader("RCA Summary (human-readable)")
-        for idx, row in df_rca.iterrows():
-            st.markdown(f"**Root Cause #{idx + 1}:**")
-            st.write(f"- **Root cause:** {row['root_cause']}")
-            st.write(f"- **Confidence:** {row['confidence']}")
-            st.write(f"- **Recommendation:** {row['recommendation']}")
-            st.write("- **Evidence:**")
-            st.code(row["evidence"], language="json")
+        # one markdown element for all causes instead of five per cause
+        chunks = []
+        for idx, row in enumerate(df_rca.to_pylist()):
+            chunks.append(
+                f"**Root Cause #{idx + 1}:**\n\n"
+                f"- **Root cause:** {row['root_cause']}\n"
+                f"- **Confidence:** {row['confidence']}\n"
+                f"- **Recommendation:** {row['recommendation']}\n"
+                f"- **Evidence:**\n\n"
+                f"```json\n{row['evidence']}\n```"
+            )
+        st.markdown("\n\n---\n\n".join(chunks))
     else:
         st.warning("RCA data is empty after flattening.")
 
@@ -270,7 +344,7 @@ if submitted:
     try:
         params = {"timeout": "60", "name": name}
         url = f"{API_BASE}/report_pro"
-        resp = requests.get(url, params=params, timeout=60)
+        resp = http_session().get(url, params=params, timeout=60)
         resp.raise_for_status()
 
         pdf_bytes = resp.content
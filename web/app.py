@@ -1,38 +1,74 @@
 import streamlit as st
 import requests
 import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
 # No secrets needed for local dashboard
 API_BASE = "http://127.0.0.1:8000"
 
 st.set_page_config(page_title="AOHI Dashboard", layout="wide")
 
+
+# The script re-runs on every interaction: keep the HTTP session (pooled
+# keep-alive connections) and the fetch threads in Streamlit's resource cache
+# so they live for the whole server process instead of one rerun.
+@st.cache_resource
+def http_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def fetch_pool():
+    return ThreadPoolExecutor(max_workers=3, thread_name_prefix="aohi-fetch")
+
+
+def get_json(path, timeout):
+    """GET API_BASE + path, uncached."""
+    r = http_session().get(f"{API_BASE}{path}", timeout=timeout)
+    r.raise_for_status()
+    return r.json()
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def fetch_json(path, timeout):
+    """get_json, reused for 15s. Errors raise, so they aren't cached."""
+    return get_json(path, timeout)
+
+
+# the three calls are independent: issue them together so the page waits for
+# the slowest one instead of the sum of all three
+pool = fetch_pool()
+health = pool.submit(fetch_json, "/health", 5)
+# force_run asks the API for a live run, so it bypasses the cache
+incidents = pool.submit(get_json, "/incidents?force_run=true", 20)
+rca = pool.submit(fetch_json, "/rca", 20)
+
 col1, col2, col3 = st.columns(3)
 
 with col1:
     st.header("API Health")
     try:
-        r = requests.get(f"{API_BASE}/health", timeout=5)
-        r.raise_for_status()
-        st.json(r.json())
+        st.json(health.result())
     except Exception as e:
         st.error(f"Health check failed: {e}")
 
 with col2:
     st.header("Incidents")
     try:
-        r = requests.get(f"{API_BASE}/incidents?force_run=true", timeout=20)
-        r.raise_for_status()
-        st.json(r.json())
+        st.json(incidents.result())
     except Exception as e:
         st.error(f"Failed to fetch incidents: {e}")
 
 with col3:
     st.header("RCA")
     try:
-        r = requests.get(f"{API_BASE}/rca", timeout=20)
-        r.raise_for_status()
-        st.json(r.json())
+        st.json(rca.result())
     except Exception as e:
         st.error(f"Failed to fetch RCA: {e}")
 
@@ -43,15 +79,16 @@ name = st.text_input("Report name", "Navaneeth Kaku")
 if st.button("Generate report now"):
     try:
         url = f"{API_BASE}/report_pro?force=true&timeout=60&name={requests.utils.quote(name)}"
-        r = requests.get(url, stream=True, timeout=120)
+        r = http_session().get(url, stream=True, timeout=120)
         # The API returns file (200) or JSON on error
         if r.headers.get("content-type") == "application/pdf" or r.status_code == 200:
             # save to /data
             out_path = "data/AOHI_FromAPI_streamlit.pdf"
             with open(out_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+                # copy straight from the socket in 1 MiB reads (undoing any
+                # gzip/deflate transfer encoding) instead of 8 KiB Python chunks
+                r.raw.decode_content = True
+                shutil.copyfileobj(r.raw, f, length=1 << 20)
             st.success(f"Report downloaded to {out_path}")
             st.markdown(f"[Open report file](./{out_path})")
         else: